@@ -1,59 +1,98 @@
-from flask import Flask, render_template, jsonify
-import feedparser
+from flask import Flask, Response, g, render_template, jsonify, request, stream_with_context, url_for
 import requests
 from datetime import datetime, timedelta
+import atexit
 import threading
 import time
 import os
-from typing import List, Dict
-import re
-from urllib.parse import urlparse
-from summarizer import summarize_article, is_financial_news
+from typing import List, Dict, Optional
+from summarizer import SUMMARIZER_BATCH_SIZE, llm_enabled, local_summaries
+from fetcher import FETCH_DEADLINE, MAX_WORKERS as FETCH_WORKERS, FeedResult, cached_feed, fetch_feed
+from feed_cache import FeedCache
+from feed_health import CLOSED, HALF_OPEN, OPEN, FeedHealthTracker
+from article_record import Article
+from article_store import ArticleStore, entry_fingerprint, entry_key
+from summary_worker import SummaryWorker
+from ranking import MIN_RELEVANCE, Ranker, keyword_score
+from dedupe import StoryIndex, minhash_signature
+from response_cache import CachedResponse, ResponseCache, json_body
+from article_index import ARTICLE_FIELDS, ArticleIndex, parse_since, project
+from keywords import find_keywords, normalize
+from textnorm import clean_html, truncate
+from snapshot import (PROFILE_TRIGGER_PATH, REFRESH_TRIGGER_PATH, SNAPSHOT_PATH, SnapshotSync,
+                      touch_trigger)
+from refresh_jobs import RefreshCoordinator
+from pipeline import Pipeline, Stage
+from feed_registry import FeedRegistry
+from archive import Archive
+from extractor import BODY_EXTRACTION, EXTRACT_WORKERS, BodyExtractor
+from metrics import (FEED_FETCH_BYTES, FEED_FETCH_SECONDS, REFRESH_ARTICLES, REFRESH_SECONDS,
+                     REGISTRY, REQUEST_SECONDS, STAGE_SECONDS, log_event)
+from profiler import PROFILER_ENABLED, SamplingProfiler
 
 app = Flask(__name__)
 
-# RSS feed URLs
-RSS_FEEDS = [
-    "https://vnexpress.net/rss/kinh-doanh.rss",
-    "https://cafef.vn/home.rss", 
-    "https://ndh.vn/rss",
-    "https://baodautu.vn/rss",
-    "https://www.vietnamplus.vn/rss/kinhte.rss",
-    "https://thoibaotaichinhvietnam.vn/rss"
-]
-
-# Source names mapping
-SOURCE_NAMES = {
-    "vnexpress.net": "VnExpress",
-    "cafef.vn": "Cafef",
-    "ndh.vn": "NDH",
-    "baodautu.vn": "Báo Đầu Tư",
-    "vietnamplus.vn": "VietnamPlus",
-    "thoibaotaichinhvietnam.vn": "Thời Báo Tài Chính"
-}
+# Feeds, their settings and source names come from feeds.json (FEEDS_CONFIG)
+feed_registry = FeedRegistry.load()
+RSS_FEEDS = feed_registry.urls()
 
 # Global variable to store articles
 articles = []
 last_update = None
+# Change-feed position the published list reflects
+articles_version = 0
+
+# Longest a change-feed request may wait, and how long an SSE stream stays open
+MAX_LONG_POLL_SECONDS = 30
+STREAM_MAX_SECONDS = int(os.getenv('STREAM_MAX_SECONDS', '300'))
+STREAM_HEARTBEAT_SECONDS = 15
+# SSE streams and long-polls one process holds open at once; each holds a
+# thread, so keep this well below gunicorn's --threads. Past it, clients are
+# told to poll instead
+MAX_STREAMS = int(os.getenv('MAX_STREAMS', '8'))
+STREAM_RETRY_SECONDS = 10
+# Distinct rendered index pages (page size x source filter) kept in memory
+PAGE_CACHE_SIZE = int(os.getenv('PAGE_CACHE_SIZE', '16'))
+
+# Conditional-GET validators and bodies, persisted between runs
+feed_cache = FeedCache()
+# Per-feed circuit breakers; failing feeds' articles are served flagged stale
+feed_health = FeedHealthTracker()
+# Every article ever published, on disk and searchable
+archive = Archive()
+atexit.register(archive.flush)
+# Every article seen so far, keyed by GUID/URL and kept newest first
+article_store = ArticleStore(on_change=archive.add)
+# Feeds whose entries are already in the store
+parsed_feeds = set()
+# Upgrades published articles with LLM summaries off the fetch path
+summary_worker = SummaryWorker(on_update=lambda article: article_store.touch(article))
+# Relevance scores and the precomputed top-K by relevance
+ranker = Ranker(feed_weight=lambda url: feed_registry.get(url).weight)
+# Near-duplicate index: the same story from several sources is kept once
+story_index = StoryIndex()
+# Serialized, compressed API responses per data version
+response_cache = ResponseCache()
+# Rendered, compressed index pages per data version, page size and source
+page_cache = ResponseCache(max_entries=PAGE_CACHE_SIZE)
+# Per-source/keyword/category indexes, rebuilt when the data version changes
+article_index = ArticleIndex()
+article_index_version = None
+# Full article text for entries whose RSS summary is too thin (opt-in)
+body_extractor = BodyExtractor() if BODY_EXTRACTION else None
+# Per-stage item counts and busy time of the last refresh
+last_pipeline_stats = {}
+# Samples one refresh's thread stacks when armed (PROFILER_ENABLED=1)
+profiler = SamplingProfiler()
 
 def clean_text(text: str) -> str:
-    """Clean and normalize text content"""
-    if not text:
-        return ""
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    """Clean and normalize text content: tags, entities, whitespace, NFC"""
+    return clean_html(text)
 
 def get_source_name(url: str) -> str:
     """Extract source name from URL"""
     try:
-        domain = urlparse(url).netloc
-        for source_domain, source_name in SOURCE_NAMES.items():
-            if source_domain in domain:
-                return source_name
-        return domain
+        return feed_registry.source_name(url)
     except:
         return "Unknown"
 
@@ -69,100 +108,627 @@ def parse_timestamp(entry) -> datetime:
     except:
         return datetime.now()
 
-def fetch_articles() -> List[Dict]:
-    """Fetch articles from all RSS feeds"""
-    all_articles = []
+def fetch_feed_before(url: str, deadline: float):
+    """Download and parse one feed, unless the refresh deadline has passed"""
+    if time.monotonic() > deadline:
+        # Never requested, so it says nothing about the feed's health
+        return FeedResult(url=url, error=f'deadline of {FETCH_DEADLINE}s exceeded', skipped=True)
+    if not feed_health.allow(url):
+        # A dead host costs nothing until its next probe
+        return FeedResult(url=url, error='circuit breaker open', skipped=True)
+    return fetch_feed(url, cache=feed_cache, skip_unchanged=url in parsed_feeds, deadline=deadline)
+
+def feed_entries(result, on_result=None) -> List:
+    """Log a fetched feed and return (feed_url, entry) pairs to process"""
+    if on_result is not None:
+        on_result(result)
+    feed_url = result.url
+    feed_health.record(result)
+    if result.skipped:
+        print(f"Skipping {feed_url}: {result.error}")
+        return stale_entries(feed_url)
+    outcome = 'error' if not result.ok else 'not_modified' if result.feed is None else 'ok'
+    FEED_FETCH_SECONDS.observe(result.elapsed, feed=feed_url, outcome=outcome)
+    if result.size:
+        FEED_FETCH_BYTES.observe(result.size, feed=feed_url)
+    log_event('feed_fetch', feed=feed_url, outcome=outcome, status=result.status,
+              seconds=round(result.elapsed, 3), bytes=result.size, error=result.error)
+    if not result.ok:
+        print(f"Error fetching {feed_url}: {result.error}")
+        return stale_entries(feed_url)
+    if result.feed is None:
+        # Unchanged since the last refresh: skip feedparser entirely
+        print(f"Feed {feed_url} unchanged ({result.elapsed:.2f}s)")
+        return []
+    print(f"Fetched {feed_url} in {result.elapsed:.2f}s")
+    if result.feed.bozo:
+        print(f"Warning: Feed {feed_url} has parsing issues")
+    parsed_feeds.add(feed_url)
+    limit = feed_registry.get(feed_url).max_entries
+    return [(feed_url, entry) for entry in result.feed.entries[:limit]]
+
+def stale_entries(feed_url: str) -> List:
+    """
+    Entries of a failing feed from its last good payload, unless the store
+    already holds them; either way they are served flagged stale
+    """
+    if feed_url in parsed_feeds:
+        return []
+    feed = cached_feed(feed_url, feed_cache)
+    if feed is None or not feed.entries:
+        return []
+    print(f"Using last good copy of {feed_url} ({len(feed.entries)} entries)")
+    parsed_feeds.add(feed_url)
+    limit = feed_registry.get(feed_url).max_entries
+    return [(feed_url, entry) for entry in feed.entries[:limit]]
+
+def clean_entry(item) -> Optional[Dict]:
+    """Skip entries already processed with the same content; clean the rest"""
+    feed_url, entry = item
+    key = entry_key(entry)
+    fingerprint = entry_fingerprint(entry)
+    if article_store.is_current(key, fingerprint):
+        return None
+    return {
+        'feed_url': feed_url,
+        'entry': entry,
+        'key': key,
+        'fingerprint': fingerprint,
+        'title': clean_text(entry.get('title', '')),
+        'content': clean_text(entry.get('summary', ''))
+    }
+
+def extract_entry(item: Dict) -> Dict:
+    """Use the article page's main text as content when it says more than the feed"""
+    url = item['entry'].get('link', '')
+    if url:
+        body = body_extractor.body(url)
+        if len(body) > len(item['content']):
+            item['content'] = body
+    return item
+
+def classify_entry(item: Dict) -> Optional[Dict]:
+    """Keep only finance/policy entries, with their score, keywords and MinHash signature"""
+    title, content = item['title'], item['content']
+    relevance = keyword_score(title, content)
+    url = item['entry'].get('link', '')
+    if relevance < MIN_RELEVANCE or not (title and url):
+        article_store.mark_seen(item['key'], item['fingerprint'])
+        return None
+    item['relevance'] = relevance
+    item['url'] = url
+    item['source'] = get_source_name(url)
+    item['matches'] = find_keywords(f"{title} {content}")
+    item['signature'] = minhash_signature(f"{title} {content}")
+    return item
+
+def summarize_entries(items: List[Dict]) -> List[Dict]:
+    """Local summaries for a batch of entries; the LLM one replaces them later"""
+    summaries = local_summaries([(item['title'], item['content']) for item in items])
+    for item, summary in zip(items, summaries):
+        item['summary'] = summary
+    return items
+
+def store_entry(item: Dict, use_llm: bool) -> bool:
+    """Fold a reprint into its story or publish a new article; True if published"""
+    key, fingerprint, signature = item['key'], item['fingerprint'], item['signature']
+    title, content, url, source = item['title'], item['content'], item['url'], item['source']
+    timestamp = int(parse_timestamp(item['entry']).timestamp())
+    feed_health.add_source(item['feed_url'], source)
     
-    for feed_url in RSS_FEEDS:
-        try:
-            print(f"Fetching from {feed_url}")
-            feed = feedparser.parse(feed_url)
-            
-            if feed.bozo:
-                print(f"Warning: Feed {feed_url} has parsing issues")
-            
-            for entry in feed.entries[:20]:  # Limit to 20 articles per feed
-                try:
-                    title = clean_text(entry.get('title', ''))
-                    content = clean_text(entry.get('summary', ''))
-                    
-                    # Only process financial/policy related articles
-                    if not is_financial_news(title, content):
-                        continue
-                    
-                    # Generate AI summary
-                    ai_summary = summarize_article(title, content, use_openai=os.getenv('OPENAI_API_KEY') is not None)
-                    
-                    article = {
-                        'title': title,
-                        'url': entry.get('link', ''),
-                        'source': get_source_name(entry.get('link', '')),
-                        'timestamp': parse_timestamp(entry),
-                        'summary': ai_summary or (content[:200] + '...' if content else ''),
-                        'ai_summary': ai_summary is not None
-                    }
-                    
-                    if article['title'] and article['url']:
-                        all_articles.append(article)
-                        
-                except Exception as e:
-                    print(f"Error parsing entry from {feed_url}: {e}")
-                    continue
-                    
-        except Exception as e:
-            print(f"Error fetching {feed_url}: {e}")
-            continue
+    # Fold reprints of a story we already have from another outlet into that story
+    if signature is not None and key not in article_store:
+        story_key = story_index.find(signature, source, timestamp)
+    else:
+        story_key = None
+    if story_key in article_store:
+        story = article_store.get(story_key)
+        story.add_source(source, url)
+        article_store.touch(story)
+        article_store.mark_seen(key, fingerprint)
+        return False
+    
+    previous = article_store.get(key)
+    article = Article(
+        title, url, source, timestamp,
+        summary=item['summary'] or truncate(content),
+        sources=previous.sources if previous else None,
+        keywords=dict.fromkeys(m.term for m in item['matches']),
+        categories=sorted({m.category for m in item['matches']}),
+        feed=item['feed_url']
+    )
+    
+    if signature is not None:
+        story_index.add(key, signature, source, timestamp)
+    ranker.add(article, item['relevance'])
+    article_store.upsert(key, fingerprint, article)
+    # Only the story's representative is ever sent to the LLM
+    if use_llm:
+        summary_worker.submit(article, content)
+    return True
+
+def fetch_articles(feeds: List[str] = RSS_FEEDS, on_result=None) -> List[Article]:
+    """
+    Fetch articles from ``feeds``, processing only new or changed entries.
+    
+    Feeds stream through fetch -> entries -> clean -> (extract) ->
+    classify -> summarize stages, and each article is published as soon as it comes
+    out, so the first feed's articles appear while the others are still
+    downloading. ``on_result`` is called with each feed's FeedResult,
+    e.g. so a scheduler can adapt that feed's polling interval.
+    """
+    global last_pipeline_stats
+    started = time.perf_counter()
+    new_count = 0
+    use_llm = llm_enabled()
+    if use_llm:
+        summary_worker.retry_failed()
     
-    # Sort by timestamp (newest first)
-    all_articles.sort(key=lambda x: x['timestamp'], reverse=True)
-    return all_articles
+    deadline = time.monotonic() + FETCH_DEADLINE
+    stages = [
+        # One download thread per feed (up to FEED_FETCH_WORKERS): fetches mostly wait on the network
+        Stage('fetch', lambda url: fetch_feed_before(url, deadline),
+              workers=max(1, min(FETCH_WORKERS, len(feeds)))),
+        Stage('entries', lambda result: feed_entries(result, on_result), expand=True),
+        Stage('clean', clean_entry),
+    ]
+    if body_extractor is not None:
+        # Page downloads wait on the network, so this stage gets the most threads
+        stages.append(Stage('extract', extract_entry, workers=EXTRACT_WORKERS))
+    stages += [
+        Stage('classify', classify_entry, workers=2),
+        Stage('summarize', summarize_entries, workers=2, batch=SUMMARIZER_BATCH_SIZE),
+    ]
+    pipeline = Pipeline(stages)
+    with profiler.refresh(f"refresh of {len(feeds)} feeds"):
+        # The sink runs here, alone, so dedupe and store updates never race
+        for item in pipeline.run(feeds):
+            stored = time.perf_counter()
+            try:
+                if store_entry(item, use_llm):
+                    new_count += 1
+            except Exception as e:
+                print(f"Error parsing entry from {item['feed_url']}: {e}")
+            STAGE_SECONDS.observe(time.perf_counter() - stored, stage='store')
+        feed_cache.save()
+        archive.flush()
+    last_pipeline_stats = pipeline.stats()
+    
+    expired = article_store.expire()
+    for key in expired:
+        story_index.remove(key)
+    print(f"Processed {new_count} new or changed articles, expired {len(expired)}")
+    snapshot = article_store.snapshot()
+    ranker.rank(snapshot)
+    elapsed = time.perf_counter() - started
+    REFRESH_SECONDS.observe(elapsed)
+    REFRESH_ARTICLES.inc(new_count)
+    log_event('refresh', feeds=len(feeds), seconds=round(elapsed, 3), new=new_count,
+              expired=len(expired), articles=len(snapshot), stages=last_pipeline_stats)
+    return snapshot
+
+def refresh_articles(feeds: List[str] = RSS_FEEDS, on_result=None) -> List[Article]:
+    """Run one refresh and make its result the published article list"""
+    global articles, last_update, articles_version
+    articles = fetch_articles(feeds, on_result)
+    articles_version = article_store.version
+    last_update = datetime.now()
+    return articles
+
+def export_state():
+    """Everything other workers need to serve this process's articles"""
+    version, records, meta = article_store.export()
+    for record in records:
+        record['keyword_score'] = ranker.keyword_score(record['article'].url)
+    meta['last_update'] = last_update.isoformat() if last_update else None
+    meta['feed_health'] = feed_health.export()
+    return version, records, meta
+
+def load_state(snapshot):
+    """Adopt the articles another worker published"""
+    global articles, last_update, articles_version
+    records = list(snapshot.records())
+    article_store.load(snapshot.version, records, snapshot.meta)
+    for record in records:
+        ranker.add(record['article'], record['keyword_score'])
+    feed_health.load(snapshot.meta.get('feed_health') or {})
+    published = snapshot.meta.get('last_update')
+    last_update = datetime.fromisoformat(published) if published else None
+    articles = article_store.snapshot()
+    articles_version = snapshot.version
+    ranker.rank(articles)
+    print(f"Loaded snapshot version {snapshot.version}: {len(articles)} articles")
+
+# With SNAPSHOT_PATH set, gunicorn workers share one published article set:
+# the refresher writes it (it sets writer), the workers map and load it
+snapshot_sync = SnapshotSync(SNAPSHOT_PATH, export_state,
+                             lambda: (article_store.version, last_update),
+                             load_state) if SNAPSHOT_PATH else None
+
+def refresh_from_writer(on_result) -> List[Article]:
+    """Ask the refresher for a refresh and wait until its snapshot is loaded"""
+    before = last_update
+    snapshot_sync.start()
+    touch_trigger(REFRESH_TRIGGER_PATH)
+    deadline = time.monotonic() + FETCH_DEADLINE + 60
+    while last_update == before:
+        if time.monotonic() > deadline:
+            raise RuntimeError('no new snapshot from the refresher; is python -m refresher running?')
+        time.sleep(snapshot_sync.interval)
+    return articles
+
+def reads_snapshots() -> bool:
+    """True in web workers that serve the refresher's snapshots and never refresh"""
+    return snapshot_sync is not None and not snapshot_sync.writer
+
+def run_refresh(on_result) -> List[Article]:
+    """Refresh here, or in the refresher when this process only reads snapshots"""
+    if reads_snapshots():
+        return refresh_from_writer(on_result)
+    return refresh_articles(on_result=on_result)
+
+# At most one refresh runs at a time; concurrent requests join it
+refresh_jobs = RefreshCoordinator(run_refresh, lambda: len(RSS_FEEDS), lambda: last_update)
+
+def warm_start():
+    """Serve the archived articles still in the retention window until the first refresh"""
+    global articles, last_update, articles_version
+    rows = archive.recent(datetime.now() - article_store.retention)
+    if not rows:
+        return
+    # Oldest first, so change-feed positions follow publication order
+    records = [{'key': key, 'seq': seq, 'fingerprint': fingerprint, 'article': article}
+               for seq, (key, fingerprint, article) in enumerate(reversed(rows), 1)]
+    article_store.load(len(records), records, {})
+    for record in records:
+        article = record['article']
+        # The raw feed content is not archived; the summary stands in for it
+        text = f"{article.title} {article.summary}"
+        ranker.add(article, keyword_score(article.title, article.summary))
+        signature = minhash_signature(text)
+        if signature is not None:
+            story_index.add(record['key'], signature, article.source, article.timestamp)
+    articles = article_store.snapshot()
+    articles_version = article_store.version
+    ranker.rank(articles)
+    last_update = archive.last_updated()
+    print(f"Warm start: {len(articles)} articles from the archive")
+
+warm_start()
+
+@app.before_request
+def start_snapshot_sync():
+    # Threads do not survive fork, so each worker starts its own on first request
+    if snapshot_sync is not None:
+        snapshot_sync.start()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    """Request latency per route, as a metric and (LOG_FORMAT=json) a log line"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_SECONDS.observe(elapsed, route=route, method=request.method, status=response.status_code)
+        log_event('request', route=route, method=request.method, status=response.status_code,
+                  seconds=round(elapsed, 4))
+    return response
+
+def cache_counts():
+    """(cache, hits, misses) for every cache, behind the hit-ratio metrics"""
+    llm = summary_worker.stats()
+    counts = [('api_response', response_cache.counters['hits'], response_cache.counters['builds']),
+              ('page', page_cache.counters['hits'], page_cache.counters['builds']),
+              ('llm_summary', llm['cached'], llm['submitted'])]
+    if body_extractor is not None:
+        bodies = body_extractor.stats()
+        counts.append(('article_body', bodies['cache_hits'], bodies['extracted'] + bodies['failed']))
+    return counts
+
+REGISTRY.collect('news_cache_hits_total', 'Cache hits by cache', 'counter',
+                 lambda: [({'cache': name}, hits) for name, hits, _ in cache_counts()])
+REGISTRY.collect('news_cache_misses_total', 'Cache misses by cache', 'counter',
+                 lambda: [({'cache': name}, misses) for name, _, misses in cache_counts()])
+REGISTRY.collect('news_feed_breaker_state', 'Feed circuit breakers: 0 closed, 1 half-open, 2 open', 'gauge',
+                 lambda: [({'feed': url}, {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}[item['state']])
+                          for url, item in feed_health.export().items()])
+REGISTRY.collect('news_articles', 'Articles currently published', 'gauge',
+                 lambda: [({}, len(articles))])
+REGISTRY.collect('news_llm_pending', 'Articles waiting for an LLM summary', 'gauge',
+                 lambda: [({}, summary_worker.stats()['pending'])])
+REGISTRY.collect('news_last_update_timestamp_seconds', 'When the published articles were last refreshed',
+                 'gauge', lambda: [({}, last_update.timestamp())] if last_update else [])
 
 def update_articles():
     """Update articles in background thread"""
-    global articles, last_update
     while True:
-        try:
-            print("Updating articles...")
-            articles = fetch_articles()
-            last_update = datetime.now()
+        print("Updating articles...")
+        job = refresh_jobs.run('scheduled')
+        if job.state == 'failed':
+            print(f"Error updating articles: {job.error}")
+        else:
             print(f"Updated {len(articles)} articles at {last_update}")
-        except Exception as e:
-            print(f"Error updating articles: {e}")
         
         # Wait 10 minutes before next update
         time.sleep(600)
 
 @app.route('/')
 def index():
-    """Main page"""
-    return render_template('index.html', articles=articles, last_update=last_update)
+    """
+    Main page, optionally only the newest ?limit= articles or one ?source=.
+    
+    Rendered and compressed once per data version and filter, then served
+    from page_cache with ETag validation.
+    """
+    limit = request.args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        limit = None
+    source = normalize(request.args.get('source', '')) or None
+    current, updated, seq = articles, last_update, articles_version
+
+    def build() -> CachedResponse:
+        if limit is None and source is None:
+            selected = current
+        else:
+            selected, _ = get_article_index().query(limit=limit, source=source)
+        # The page's script follows the change feed from here instead of refetching everything
+        initial = {'seq': seq, 'articles': [article.to_json() for article in selected],
+                   'source': source, 'limit': limit}
+        html = render_template('index.html', articles=selected, last_update=updated, initial=initial)
+        return CachedResponse(html.encode('utf-8'), mimetype='text/html', last_modified=updated)
+
+    # Keyed on the parsed filters, so unrelated query strings share one entry
+    key = (article_store.version, updated, limit, source)
+    return page_cache.get_or_build(key, build).to_response(request)
+
+def get_article_index() -> ArticleIndex:
+    """Index over the current articles, rebuilt once per data version"""
+    global article_index, article_index_version
+    version = (article_store.version, id(articles))
+    if article_index_version != version:
+        article_index = ArticleIndex(articles)
+        article_index_version = version
+    return article_index
 
 @app.route('/api/articles')
 def api_articles():
-    """API endpoint for articles"""
+    """
+    API endpoint for articles, newest first or ?sort=relevance.
+    
+    Optional query parameters: limit, cursor (from next_cursor), source,
+    since (epoch seconds or ISO 8601), keyword, category and fields
+    (comma-separated list of article fields to return). sort=relevance
+    takes only limit and fields.
+    """
+    args = request.args
+    sort = args.get('sort')
+    limit = args.get('limit', type=int)
+    fields = [f for f in args.get('fields', '').split(',') if f] or None
+    try:
+        since = parse_since(args['since']) if args.get('since') else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid since timestamp'}), 400
+    if fields and not set(fields) <= set(ARTICLE_FIELDS):
+        return jsonify({'success': False, 'message': f'Unknown fields; choose from {", ".join(ARTICLE_FIELDS)}'}), 400
+    if limit is not None and limit < 0:
+        return jsonify({'success': False, 'message': 'limit must not be negative'}), 400
+    filters = [name for name in ('cursor', 'source', 'since', 'keyword', 'category') if args.get(name)]
+    if sort == 'relevance' and filters:
+        return jsonify({'success': False,
+                        'message': f'sort=relevance cannot be combined with {", ".join(filters)}'}), 400
+    current, updated = articles, last_update
+
+    def build() -> CachedResponse:
+        next_cursor = None
+        if sort == 'relevance':
+            selected = ranker.top(limit)
+        else:
+            selected, next_cursor = get_article_index().query(
+                limit=limit, cursor=args.get('cursor'), source=args.get('source'),
+                since=since, keyword=args.get('keyword'), category=args.get('category'))
+        stale = feed_health.stale_feeds(get_source_name)
+        items = [project(article, fields) for article in selected]
+        for item, article in zip(items, selected):
+            if article.feed in stale:
+                # Last known good: the feed that delivered it is failing and
+                # this may be out of date; the outlet's other feeds may be fine
+                item['stale'] = True
+        payload = {
+            'articles': items,
+            'last_update': updated.isoformat() if updated else None,
+            'count': len(selected),
+            'total': len(current),
+            'stale_feeds': stale
+        }
+        if next_cursor:
+            payload['next_cursor'] = next_cursor
+        return CachedResponse(json_body(payload), last_modified=updated)
+
+    # Serialized once per data version and query, not once per poll
+    key = (article_store.version, feed_health.version, updated, request.query_string)
+    try:
+        return response_cache.get_or_build(key, build).to_response(request)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+
+def parse_seq(value) -> int:
+    try:
+        return max(0, int(value or 0))
+    except ValueError:
+        return 0
+
+def changes_payload(seq: int) -> Dict:
+    """Change-feed body: articles added/changed and URLs removed after ``seq``"""
+    changes = article_store.changes_since(seq)
+    changes['articles'] = [article.to_json() for article in changes['articles']]
+    changes['count'] = len(changes['articles'])
+    changes['last_update'] = last_update.isoformat() if last_update else None
+    return changes
+
+# Threads held by streams and long-polls, so they cannot starve other requests
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+def streams_busy():
+    """503 for a stream or long-poll over MAX_STREAMS; plain polling still works"""
+    response = jsonify({'success': False,
+                        'message': 'Too many open streams; poll /api/changes without wait'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(STREAM_RETRY_SECONDS)
+    return response
+
+@app.route('/api/changes')
+def api_changes():
+    """
+    Change feed: articles added or updated since ?since=<seq>.
+    
+    With ?wait=<seconds> the request is held open (long-poll) until
+    something changes or the wait expires. since=0 returns every article.
+    """
+    seq = parse_seq(request.args.get('since'))
+    wait = min(request.args.get('wait', 0, type=float), MAX_LONG_POLL_SECONDS)
+    if wait > 0:
+        if not stream_slots.acquire(blocking=False):
+            return streams_busy()
+        try:
+            article_store.wait_for_change(seq, wait)
+        finally:
+            stream_slots.release()
+    return jsonify(changes_payload(seq))
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events stream of change-feed batches as refreshes commit them"""
+    # EventSource sends Last-Event-ID when it reconnects
+    seq = parse_seq(request.headers.get('Last-Event-ID') or request.args.get('since'))
+    if not stream_slots.acquire(blocking=False):
+        return streams_busy()
+
+    def events():
+        last_seq = seq
+        deadline = time.monotonic() + STREAM_MAX_SECONDS
+        # Tell the browser how soon to reconnect once the stream is closed
+        yield "retry: 3000\n\n"
+        while time.monotonic() < deadline:
+            if article_store.version != last_seq:
+                payload = changes_payload(last_seq)
+                last_seq = payload['seq']
+                yield f"id: {last_seq}\nevent: changes\ndata: {json_body(payload).decode('utf-8').strip()}\n\n"
+            elif not article_store.wait_for_change(
+                    last_seq, min(STREAM_HEARTBEAT_SECONDS, max(0.0, deadline - time.monotonic()))):
+                yield ": keepalive\n\n"
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    # Runs when the stream ends or the client goes away, even before it started
+    response.call_on_close(stream_slots.release)
+    return response
+
+@app.route('/api/search')
+def api_search():
+    """
+    Full-text search over every archived article, ignoring diacritics.
+    
+    Query parameters: q (required), limit, source, since, fields, and
+    sort=date for the newest matches instead of the best ones.
+    """
+    args = request.args
+    query = args.get('q', '').strip()
+    limit = args.get('limit', 20, type=int)
+    fields = [f for f in args.get('fields', '').split(',') if f] or None
+    if not query:
+        return jsonify({'success': False, 'message': 'Missing search query q'}), 400
+    if limit < 1:
+        return jsonify({'success': False, 'message': 'limit must be positive'}), 400
+    if fields and not set(fields) <= set(ARTICLE_FIELDS):
+        return jsonify({'success': False, 'message': f'Unknown fields; choose from {", ".join(ARTICLE_FIELDS)}'}), 400
+    try:
+        since = parse_since(args['since']) if args.get('since') else None
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid since timestamp'}), 400
+    if not archive.enabled:
+        return jsonify({'success': False, 'message': 'Search is not available'}), 503
+    
+    results = archive.search(query, limit=limit, source=args.get('source'),
+                             since=since, newest=args.get('sort') == 'date')
     return jsonify({
-        'articles': articles,
+        'articles': [project(article, fields) for article in results],
+        'count': len(results),
+        'query': query
+    })
+
+def refresh_job_response(job, started: bool, **extra):
+    """202 with the job while it runs, 200 once there is nothing left to wait for"""
+    if started:
+        message = 'Refresh started'
+    elif job.state == 'running':
+        message = 'Joined the refresh already in progress'
+    else:
+        message = 'Articles were refreshed recently'
+    response = jsonify({
+        'success': True,
+        'message': message,
+        'job': job.to_dict(),
         'last_update': last_update.isoformat() if last_update else None,
-        'count': len(articles)
+        **extra
     })
+    response.status_code = 202 if job.state == 'running' else 200
+    response.headers['Location'] = url_for('api_refresh_status', job_id=job.id)
+    return response
 
-@app.route('/api/refresh')
+@app.route('/api/refresh', methods=['GET', 'POST'])
 def api_refresh():
-    """Manual refresh endpoint"""
-    global articles, last_update
-    try:
-        articles = fetch_articles()
-        last_update = datetime.now()
-        return jsonify({
-            'success': True,
-            'message': f'Refreshed {len(articles)} articles',
-            'last_update': last_update.isoformat()
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Error: {str(e)}'
-        }), 500
+    """Start a refresh, or join the one in progress, without waiting for it"""
+    job, started = refresh_jobs.start('manual')
+    return refresh_job_response(job, started)
+
+@app.route('/api/refresh/<job_id>')
+def api_refresh_status(job_id):
+    """State and progress (feeds fetched so far) of a refresh job"""
+    job = refresh_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Unknown refresh job'}), 404
+    return jsonify({
+        'success': True,
+        'job': job.to_dict(),
+        'last_update': last_update.isoformat() if last_update else None
+    })
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint: fetch, pipeline, LLM, cache and request metrics"""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/debug/profile', methods=['POST'])
+def arm_profile():
+    """Sample the stacks of the next refresh (PROFILER_ENABLED=1 only)"""
+    if not PROFILER_ENABLED:
+        return jsonify({'success': False, 'message': 'Profiling is disabled (set PROFILER_ENABLED=1)'}), 404
+    if reads_snapshots():
+        # Refreshes run in the refresher; arm its profiler instead
+        touch_trigger(PROFILE_TRIGGER_PATH)
+        return jsonify({'success': True, 'message': "The refresher's next refresh will be profiled"}), 202
+    profiler.arm()
+    return jsonify({'success': True, 'message': 'The next refresh will be profiled'}), 202
+
+@app.route('/debug/profile')
+def last_profile():
+    """Per-stage and per-feed samples of the last profiled refresh; ?format=collapsed for flame graphs"""
+    if not PROFILER_ENABLED:
+        return jsonify({'success': False, 'message': 'Profiling is disabled (set PROFILER_ENABLED=1)'}), 404
+    # The refresher profiles in production; its report is shared through PROFILE_PATH
+    report = profiler.saved_report() if reads_snapshots() else profiler.last_report
+    if report is None:
+        return jsonify({'success': False, 'message': 'No refresh has been profiled yet'}), 404
+    if request.args.get('format') == 'collapsed':
+        return Response(report['collapsed'], mimetype='text/plain')
+    armed = os.path.exists(PROFILE_TRIGGER_PATH) if reads_snapshots() else profiler.armed
+    return jsonify({'success': True, 'armed': armed,
+                    'profile': {k: v for k, v in report.items() if k != 'collapsed'}})
 
 if __name__ == '__main__':
     # Start background thread for updating articles
@@ -171,8 +737,7 @@ if __name__ == '__main__':
     
     # Initial fetch
     print("Starting initial article fetch...")
-    articles = fetch_articles()
-    last_update = datetime.now()
+    refresh_jobs.run('startup')
     print(f"Initial fetch complete: {len(articles)} articles")
     
     # Run Flask app
@@ -0,0 +1,197 @@
+"""
+On-disk archive of every article ever published, with full-text search.
+
+Articles live in SQLite (WAL mode) as JSON next to an FTS5 index of
+their title and summary. Indexed text and queries are both folded to
+lowercase without Vietnamese diacritics (đ -> d included), so
+"lai suat" finds "lãi suất". Writes are queued and committed in
+batches; readers get their own connections and never wait on writes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from article_record import Article
+from dedupe import fold
+
+ARCHIVE_PATH = os.getenv('ARCHIVE_PATH', os.path.join('.cache', 'articles.sqlite3'))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', '500'))
+MAX_SEARCH_RESULTS = 100
+
+_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS articles (
+        id INTEGER PRIMARY KEY,
+        key TEXT NOT NULL UNIQUE,
+        fingerprint TEXT NOT NULL,
+        url TEXT NOT NULL,
+        source TEXT NOT NULL,
+        published REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS articles_published ON articles (published);
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title, summary);
+'''
+
+
+def fold_text(text: str) -> str:
+    """Lowercase, diacritic-free text as stored in the search index"""
+    return ' '.join(fold(text or ''))
+
+
+def match_query(query: str) -> Optional[str]:
+    """FTS5 query matching every folded word, the last one as a prefix"""
+    words = fold(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _encode(data: Dict) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _decode(data: str) -> Article:
+    return Article.from_dict(json.loads(data))
+
+
+class Archive:
+    """Batched writer and concurrent reader over the article archive"""
+
+    def __init__(self, path: Optional[str] = ARCHIVE_PATH, batch_size: int = ARCHIVE_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        # key -> (fingerprint, article dict) waiting for the next batch
+        self._pending: Dict[str, Tuple[str, Dict]] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self.counters = {'written': 0, 'batches': 0, 'searches': 0}
+        self._db = self._connect() if path else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._db is not None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.executescript(_SCHEMA)
+            db.commit()
+            return db
+        except Exception as e:
+            # Read-only filesystems (e.g. serverless) run without an archive
+            print(f"Article archive disabled: {e}")
+            return None
+
+    def _reader(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        return db
+
+    def add(self, key: str, fingerprint: str, article: Article):
+        """Queue an article for the next batch; a later add of the same key wins"""
+        if self._db is None:
+            return
+        # Copied now: the LLM worker may still change the live article
+        data = article.to_dict()
+        with self._pending_lock:
+            self._pending[key] = (fingerprint, data)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write queued articles in one transaction; returns how many"""
+        if self._db is None:
+            return 0
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        now = time.time()
+        with self._write_lock:
+            try:
+                with self._db:
+                    for key, (fingerprint, data) in pending.items():
+                        (row_id,) = self._db.execute('''
+                            INSERT INTO articles (key, fingerprint, url, source, published, updated_at, data)
+                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT (key) DO UPDATE SET
+                                fingerprint = excluded.fingerprint, url = excluded.url,
+                                source = excluded.source, published = excluded.published,
+                                updated_at = excluded.updated_at, data = excluded.data
+                            RETURNING id
+                        ''', (key, fingerprint, data['url'], data['source'],
+                              data['timestamp'], now, _encode(data))).fetchone()
+                        self._db.execute(
+                            'INSERT OR REPLACE INTO articles_fts (rowid, title, summary) VALUES (?, ?, ?)',
+                            (row_id, fold_text(data['title']), fold_text(data['summary'])))
+            except Exception as e:
+                print(f"Error writing article archive: {e}")
+                return 0
+            self.counters['written'] += len(pending)
+            self.counters['batches'] += 1
+        return len(pending)
+
+    def recent(self, since: datetime) -> List[Tuple[str, str, Article]]:
+        """(key, fingerprint, article) published at or after ``since``, newest first"""
+        if self._db is None:
+            return []
+        rows = self._reader().execute(
+            'SELECT key, fingerprint, data FROM articles WHERE published >= ? ORDER BY published DESC',
+            (since.timestamp(),)).fetchall()
+        return [(key, fingerprint, _decode(data)) for key, fingerprint, data in rows]
+
+    def last_updated(self) -> Optional[datetime]:
+        if self._db is None:
+            return None
+        (updated,) = self._reader().execute('SELECT MAX(updated_at) FROM articles').fetchone()
+        return datetime.fromtimestamp(updated) if updated else None
+
+    def search(self, query: str, limit: int = 20, source: Optional[str] = None,
+               since: Optional[datetime] = None, newest: bool = False) -> List[Article]:
+        """Best matches for ``query`` (BM25), or the newest matches with ``newest``"""
+        expression = match_query(query)
+        if self._db is None or expression is None:
+            return []
+        # Pick the ids first so only the page's JSON is read, not every match's
+        sql = ['SELECT a.id FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid',
+               'WHERE articles_fts MATCH ?']
+        params: list = [expression]
+        if source:
+            sql.append('AND a.source = ?')
+            params.append(source)
+        if since is not None:
+            sql.append('AND a.published >= ?')
+            params.append(since.timestamp())
+        sql.append('ORDER BY a.published DESC' if newest else 'ORDER BY articles_fts.rank')
+        sql.append('LIMIT ?')
+        params.append(min(limit, MAX_SEARCH_RESULTS))
+        self.counters['searches'] += 1
+        db = self._reader()
+        ids = [row_id for (row_id,) in db.execute(' '.join(sql), params)]
+        if not ids:
+            return []
+        placeholders = ','.join('?' * len(ids))
+        data = dict(db.execute(f'SELECT id, data FROM articles WHERE id IN ({placeholders})', ids))
+        return [_decode(data[row_id]) for row_id in ids]
+
+    def stats(self) -> Dict:
+        stats = dict(self.counters)
+        with self._pending_lock:
+            stats['pending'] = len(self._pending)
+        return stats
@@ -0,0 +1,142 @@
+"""
+Secondary indexes over the published article list for paginated,
+filtered API queries
+"""
+
+import base64
+import bisect
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from article_record import ARTICLE_FIELDS, Article
+from keywords import normalize
+
+
+def encode_cursor(article: Article) -> str:
+    raw = f"{article.timestamp!r}|{article.url}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """(timestamp, url) of the last article on the previous page; ValueError if malformed"""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    timestamp, url = base64.urlsafe_b64decode(padded).decode('utf-8').split('|', 1)
+    return float(timestamp), url
+
+
+def parse_since(value: str) -> datetime:
+    """Epoch seconds or an ISO 8601 timestamp; ValueError if neither or out of range"""
+    try:
+        seconds = float(value)
+    except ValueError:
+        return datetime.fromisoformat(value)
+    try:
+        return datetime.fromtimestamp(seconds)
+    except (OverflowError, OSError) as e:
+        raise ValueError(f'timestamp out of range: {value}') from e
+
+
+class _Posting:
+    """Articles newest first with their (-timestamp, url) sort keys"""
+
+    def __init__(self):
+        self.keys: List[Tuple[float, str]] = []
+        self.items: List[Article] = []
+
+    def append(self, key: Tuple[float, str], article: Article):
+        self.keys.append(key)
+        self.items.append(article)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class ArticleIndex:
+    """
+    Time-ordered list plus per-source, per-keyword and per-category
+    postings, built once per refresh. A query walks the smallest matching
+    posting from the cursor, so a page costs O(page size) for
+    single-filter queries instead of serializing every article.
+    """
+
+    def __init__(self, articles: Iterable[Article] = ()):
+        ordered = sorted(articles, key=self._key)
+        self.all = _Posting()
+        self.by_source: Dict[str, _Posting] = {}
+        self.by_keyword: Dict[str, _Posting] = {}
+        self.by_category: Dict[str, _Posting] = {}
+        for article in ordered:
+            key = self._key(article)
+            self.all.append(key, article)
+            for source in _article_sources(article):
+                self.by_source.setdefault(source, _Posting()).append(key, article)
+            for term in article.keywords:
+                self.by_keyword.setdefault(normalize(term), _Posting()).append(key, article)
+            for category in article.categories:
+                self.by_category.setdefault(category, _Posting()).append(key, article)
+
+    @staticmethod
+    def _key(article: Article) -> Tuple[float, str]:
+        return (-article.timestamp, article.url)
+
+    def __len__(self) -> int:
+        return len(self.all)
+
+    def query(self, limit: Optional[int] = None, cursor: Optional[str] = None,
+              source: Optional[str] = None, since: Optional[datetime] = None,
+              keyword: Optional[str] = None, category: Optional[str] = None
+              ) -> Tuple[List[Article], Optional[str]]:
+        """One page of matching articles, newest first, and the next cursor"""
+        candidates = [(self.all, None)]
+        if source is not None:
+            source = normalize(source)
+            candidates.append((self.by_source.get(source, _Posting()),
+                               lambda a: source in _article_sources(a)))
+        if keyword is not None:
+            keyword = normalize(keyword)
+            candidates.append((self.by_keyword.get(keyword, _Posting()),
+                               lambda a: keyword in {normalize(t) for t in a.keywords}))
+        if category is not None:
+            candidates.append((self.by_category.get(category, _Posting()),
+                               lambda a: category in a.categories))
+        # Walk the most selective posting; check the other filters per article
+        posting, _ = min(candidates, key=lambda c: len(c[0]))
+        checks = [check for p, check in candidates if p is not posting and check]
+
+        start, end = 0, len(posting)
+        if cursor:
+            start = bisect.bisect_right(posting.keys, self._cursor_key(cursor))
+        if since is not None:
+            end = bisect.bisect_right(posting.keys, (-since.timestamp(), '\U0010ffff'))
+
+        # Look for one extra match to know whether another page exists
+        wanted = None if limit is None else limit + 1
+        page = []
+        for position in range(start, end):
+            article = posting.items[position]
+            if all(check(article) for check in checks):
+                page.append(article)
+                if wanted is not None and len(page) == wanted:
+                    break
+
+        next_cursor = None
+        if wanted is not None and len(page) == wanted:
+            page.pop()
+            next_cursor = encode_cursor(page[-1]) if page else None
+        return page, next_cursor
+
+    @staticmethod
+    def _cursor_key(cursor: str) -> Tuple[float, str]:
+        timestamp, url = decode_cursor(cursor)
+        return (-timestamp, url)
+
+
+def _article_sources(article: Article) -> set:
+    sources = {normalize(name) for name, _ in article.sources}
+    sources.add(normalize(article.source))
+    return sources
+
+
+def project(article: Article, fields: Optional[List[str]]) -> Dict:
+    """The API representation of an article, only the requested fields if any"""
+    return article.to_json(fields)
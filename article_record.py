@@ -0,0 +1,100 @@
+"""
+Compact in-memory article records.
+
+An article is a __slots__ object rather than a dict: no per-article hash
+table, the publication time as integer epoch seconds instead of a
+datetime, and source names, keywords and categories interned so every
+article from one outlet shares the same string objects.
+"""
+
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from werkzeug.http import http_date
+
+# Fields clients may ask for with ?fields=, in API order
+ARTICLE_FIELDS = ('title', 'url', 'source', 'sources', 'timestamp', 'summary',
+                  'ai_summary', 'relevance', 'keywords', 'categories')
+
+
+def _interned(values: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values)
+
+
+class Article:
+    """
+    One published article. ``sources`` holds a (source, url) pair per
+    outlet carrying the story, this one first; ``relevance`` is set by
+    the ranker and ``summary``/``ai_summary`` by the LLM worker. ``feed``
+    is the URL of the feed that delivered it (empty if unknown); it is
+    stored but not part of the API.
+    """
+
+    __slots__ = ARTICLE_FIELDS + ('feed',)
+
+    def __init__(self, title: str, url: str, source: str, timestamp: int, summary: str = '',
+                 sources: Optional[Iterable[Tuple[str, str]]] = None, ai_summary: bool = False,
+                 relevance: float = 0.0, keywords: Iterable[str] = (), categories: Iterable[str] = (),
+                 feed: str = ''):
+        self.title = title
+        self.url = url
+        self.source = sys.intern(source)
+        self.sources = (tuple((sys.intern(name), link) for name, link in sources)
+                        if sources else ((self.source, url),))
+        self.timestamp = int(timestamp)
+        self.summary = summary
+        self.ai_summary = ai_summary
+        self.relevance = relevance
+        self.keywords = _interned(keywords)
+        self.categories = _interned(categories)
+        self.feed = sys.intern(feed)
+
+    @property
+    def published(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp)
+
+    def add_source(self, source: str, url: str):
+        """Record another outlet carrying the same story"""
+        if all(link != url for _, link in self.sources):
+            self.sources += ((sys.intern(source), url),)
+
+    def to_dict(self) -> Dict:
+        """JSON-ready dict with the timestamp in epoch seconds, for storage"""
+        data = {field: getattr(self, field) for field in ARTICLE_FIELDS}
+        data['sources'] = [{'source': name, 'url': link} for name, link in self.sources]
+        data['keywords'] = list(self.keywords)
+        data['categories'] = list(self.categories)
+        data['feed'] = self.feed
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        """Inverse of to_dict; also reads records written before they were compact"""
+        return cls(data['title'], data['url'], data['source'], data['timestamp'],
+                   summary=data.get('summary', ''),
+                   sources=[(item['source'], item['url']) for item in data.get('sources') or ()],
+                   ai_summary=data.get('ai_summary', False),
+                   relevance=data.get('relevance') or 0.0,
+                   keywords=data.get('keywords', ()), categories=data.get('categories', ()),
+                   feed=data.get('feed', ''))
+
+    def to_json(self, fields: Optional[Iterable[str]] = None) -> Dict:
+        """
+        The API representation, optionally only some ``fields``. The
+        timestamp is an HTTP date, exactly as Flask rendered the datetime.
+        """
+        data = {}
+        for field in fields or ARTICLE_FIELDS:
+            if field == 'timestamp':
+                data[field] = http_date(self.published)
+            elif field == 'sources':
+                data[field] = [{'source': name, 'url': link} for name, link in self.sources]
+            elif field in ('keywords', 'categories'):
+                data[field] = list(getattr(self, field))
+            else:
+                data[field] = getattr(self, field)
+        return data
+
+    def __repr__(self) -> str:
+        return f"Article({self.url!r}, {self.source!r}, {self.timestamp})"
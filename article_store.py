@@ -0,0 +1,249 @@
+"""
+Incremental article store keyed by entry GUID / canonical URL
+"""
+
+import bisect
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from article_record import Article
+
+RETENTION_HOURS = float(os.getenv('ARTICLE_RETENTION_HOURS', '48'))
+# Removals remembered for the change feed before clients must resync
+MAX_TOMBSTONES = 5000
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a link so trivial variants map to the same article"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    netloc = parts.netloc.lower()
+    if netloc.startswith('www.'):
+        netloc = netloc[4:]
+    # Tracking parameters and fragments never identify a different story
+    query = '&'.join(p for p in parts.query.split('&')
+                     if p and not p.startswith(('utm_', 'fbclid=', 'gclid=')))
+    return urlunsplit(('https', netloc, parts.path.rstrip('/'), query, ''))
+
+
+def entry_key(entry) -> str:
+    """Stable identity for an RSS entry: its GUID, falling back to its link"""
+    guid = entry.get('id') or entry.get('guid')
+    if guid and guid.startswith('http'):
+        return canonical_url(guid)
+    if guid:
+        return guid
+    return canonical_url(entry.get('link', ''))
+
+
+def entry_fingerprint(entry) -> str:
+    """Hash of the raw fields an article is built from, to detect edits"""
+    raw = '\x1f'.join((entry.get('title', ''), entry.get('summary', ''),
+                       entry.get('link', '')))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class ArticleStore:
+    """
+    Articles kept newest-first without re-sorting on every refresh.
+
+    Every entry seen (kept or filtered out) is remembered with its
+    fingerprint, so a refresh only cleans, classifies and summarizes
+    entries that are new or changed. Articles older than the retention
+    window are dropped from the tail of the ordering.
+    """
+
+    def __init__(self, retention_hours: float = RETENTION_HOURS,
+                 on_change: Optional[Callable[[str, str, Article], None]] = None):
+        self.retention = timedelta(hours=retention_hours)
+        # Called with (key, fingerprint, article) after every add or edit
+        self.on_change = on_change
+        self._lock = threading.RLock()
+        self._articles: Dict[str, Article] = {}
+        # (-timestamp, key), ascending == newest first
+        self._order: List[Tuple[int, str]] = []
+        # key -> (fingerprint, last seen), oldest sighting first
+        self._seen: "OrderedDict[str, Tuple[str, datetime]]" = OrderedDict()
+        self._snapshot: Optional[List[Article]] = None
+        # Bumped on every change, including in-place edits reported via touch();
+        # doubles as the sequence number of the change feed
+        self.version = 0
+        self._changed = threading.Condition(self._lock)
+        # url -> (seq, key) of each live article's latest change, oldest first
+        self._changes: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        # url -> seq of removals, oldest first, bounded by MAX_TOMBSTONES
+        self._removed: "OrderedDict[str, int]" = OrderedDict()
+        # Clients behind this seq may have missed pruned removals
+        self._tombstone_floor = 0
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._articles
+
+    def get(self, key: str) -> Optional[Article]:
+        return self._articles.get(key)
+
+    def is_current(self, key: str, fingerprint: str) -> bool:
+        """True if ``key`` was already processed with this exact content"""
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is None or seen[0] != fingerprint:
+                return False
+            self._seen[key] = (fingerprint, datetime.now())
+            self._seen.move_to_end(key)
+            return True
+
+    def mark_seen(self, key: str, fingerprint: str):
+        """Remember an entry that was processed but not kept"""
+        with self._lock:
+            self._seen[key] = (fingerprint, datetime.now())
+            self._seen.move_to_end(key)
+
+    def _sort_key(self, key: str, article: Article) -> Tuple[int, str]:
+        return (-article.timestamp, key)
+
+    def _unlink(self, key: str):
+        old = self._articles.pop(key, None)
+        if old is not None:
+            position = bisect.bisect_left(self._order, self._sort_key(key, old))
+            if position < len(self._order) and self._order[position][1] == key:
+                del self._order[position]
+
+    def _record(self, key: str, article: Article):
+        self.version += 1
+        self._changes[article.url] = (self.version, key)
+        self._changes.move_to_end(article.url)
+        self._removed.pop(article.url, None)
+        self._changed.notify_all()
+        if self.on_change is not None:
+            self.on_change(key, self._seen.get(key, ('',))[0], article)
+
+    def upsert(self, key: str, fingerprint: str, article: Article):
+        """Insert a new or changed article at its place in the ordering"""
+        with self._lock:
+            self.mark_seen(key, fingerprint)
+            previous = self._articles.get(key)
+            if previous is not None and previous.url != article.url:
+                self._changes.pop(previous.url, None)
+            self._unlink(key)
+            self._articles[key] = article
+            bisect.insort(self._order, self._sort_key(key, article))
+            self._snapshot = None
+            self._record(key, article)
+
+    def touch(self, article: Article):
+        """Record that a stored article was modified in place"""
+        with self._lock:
+            entry = self._changes.get(article.url)
+            if entry is not None and self._articles.get(entry[1]) is article:
+                self._record(entry[1], article)
+
+    def expire(self, now: Optional[datetime] = None) -> List[str]:
+        """Drop articles and sightings older than the retention window; returns removed keys"""
+        cutoff = (now or datetime.now()) - self.retention
+        oldest = cutoff.timestamp()
+        removed = []
+        with self._lock:
+            while self._order and -self._order[-1][0] < oldest:
+                _, key = self._order.pop()
+                article = self._articles.pop(key, None)
+                removed.append(key)
+                if article is not None:
+                    self.version += 1
+                    self._changes.pop(article.url, None)
+                    self._removed[article.url] = self.version
+            while len(self._removed) > MAX_TOMBSTONES:
+                _, seq = self._removed.popitem(last=False)
+                self._tombstone_floor = seq
+            while self._seen:
+                key, (_, last_seen) = next(iter(self._seen.items()))
+                if last_seen >= cutoff:
+                    break
+                self._seen.popitem(last=False)
+            if removed:
+                self._snapshot = None
+                self._changed.notify_all()
+        return removed
+
+    def changes_since(self, seq: int) -> Dict:
+        """
+        Articles added or changed, and URLs removed, after sequence ``seq``.
+
+        Costs O(changes) by walking the change logs from their newest end.
+        'reset' is True when ``seq`` is too old for the removal log, in
+        which case 'articles' holds every live article and the client
+        should replace its copy.
+        """
+        with self._lock:
+            # A seq from the future comes from another process's store
+            reset = seq < self._tombstone_floor or seq > self.version
+            if reset:
+                seq = 0
+            updated = []
+            for url in reversed(self._changes):
+                change_seq, key = self._changes[url]
+                if change_seq <= seq:
+                    break
+                updated.append(self._articles[key])
+            removed = []
+            for url in reversed(self._removed):
+                if self._removed[url] <= seq:
+                    break
+                removed.append(url)
+            updated.reverse()
+            removed.reverse()
+            return {'seq': self.version, 'reset': reset,
+                    'articles': updated, 'removed': removed}
+
+    def wait_for_change(self, seq: int, timeout: float) -> bool:
+        """Block until the store moves away from ``seq``; False on timeout"""
+        with self._lock:
+            return self._changed.wait_for(lambda: self.version != seq, timeout)
+
+    def export(self) -> Tuple[int, List[Dict], Dict]:
+        """(version, records, meta) describing the whole store, for snapshot files"""
+        with self._lock:
+            records = [{'key': key, 'seq': seq, 'fingerprint': self._seen.get(key, ('',))[0],
+                        'article': self._articles[key]}
+                       for seq, key in self._changes.values()]
+            meta = {'tombstones': list(self._removed.items()),
+                    'tombstone_floor': self._tombstone_floor,
+                    'seen': {key: fingerprint for key, (fingerprint, _) in self._seen.items()}}
+            return self.version, records, meta
+
+    def load(self, version: int, records: List[Dict], meta: Dict):
+        """Replace the whole store with an exported one and wake waiters"""
+        now = datetime.now()
+        with self._lock:
+            self._articles = {}
+            self._order = []
+            self._changes = OrderedDict()
+            self._seen = OrderedDict((key, (fingerprint, now))
+                                     for key, fingerprint in meta.get('seen', {}).items())
+            for record in records:
+                key, article = record['key'], record['article']
+                self._articles[key] = article
+                self._order.append(self._sort_key(key, article))
+                self._changes[article.url] = (record['seq'], key)
+                self._seen[key] = (record['fingerprint'], now)
+            self._order.sort()
+            self._removed = OrderedDict((url, seq) for url, seq in meta.get('tombstones', ()))
+            self._tombstone_floor = meta.get('tombstone_floor', 0)
+            self._snapshot = None
+            self.version = version
+            self._changed.notify_all()
+
+    def snapshot(self) -> List[Article]:
+        """Articles newest first; rebuilt only after the store changed"""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = [self._articles[key] for _, key in self._order]
+            return self._snapshot
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/articles throughput with many polling clients:
+jsonify on every request vs the precomputed, ETag-validated response
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+os.environ.setdefault('FEED_CACHE_DIR', tempfile.mkdtemp())
+os.environ.setdefault('SUMMARY_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'summaries.sqlite3'))
+
+from flask import jsonify
+
+import app as aggregator
+from article_record import Article
+
+CLIENTS = int(os.getenv('BENCH_CLIENTS', '300'))
+POLLS_PER_CLIENT = int(os.getenv('BENCH_POLLS', '10'))
+ARTICLE_COUNT = int(os.getenv('BENCH_ARTICLES', '300'))
+
+
+def make_articles(count):
+    now = datetime.now()
+    return [Article(
+        f"Ngân hàng Nhà nước điều chỉnh lãi suất điều hành lần {i}",
+        f"https://vnexpress.net/bai-viet-{i}.html",
+        "VnExpress",
+        (now - timedelta(minutes=i)).timestamp(),
+        summary="Tin tức về lãi suất, ngân hàng trong lĩnh vực tài chính.",
+        relevance=1.0,
+    ) for i in range(count)]
+
+
+@aggregator.app.route('/bench/articles-uncached')
+def articles_uncached():
+    """The previous implementation: serialize everything on every request"""
+    return jsonify({
+        'articles': [article.to_json() for article in aggregator.articles],
+        'last_update': aggregator.last_update.isoformat() if aggregator.last_update else None,
+        'count': len(aggregator.articles)
+    })
+
+
+def poll(path, conditional):
+    client = aggregator.app.test_client()
+    etag = None
+    sent = received = 0
+    for _ in range(POLLS_PER_CLIENT):
+        headers = {'Accept-Encoding': 'gzip'}
+        if conditional and etag:
+            headers['If-None-Match'] = etag
+        response = client.get(path, headers=headers)
+        etag = response.headers.get('ETag')
+        sent += 1
+        received += len(response.data)
+    return sent, received
+
+
+def run(label, path, conditional):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(lambda _: poll(path, conditional), range(CLIENTS)))
+    elapsed = time.perf_counter() - started
+    requests_made = sum(r[0] for r in results)
+    received = sum(r[1] for r in results)
+    print(f"{label:<34} {requests_made / elapsed:9.0f} req/s  "
+          f"{received / requests_made / 1024:8.1f} KiB/request")
+    return requests_made / elapsed
+
+
+def main():
+    print("/api/articles polling benchmark")
+    print("=" * 60)
+    print(f"{CLIENTS} clients x {POLLS_PER_CLIENT} polls, {ARTICLE_COUNT} articles")
+
+    aggregator.articles = make_articles(ARTICLE_COUNT)
+    aggregator.last_update = datetime.now()
+
+    before = run("jsonify per request", '/bench/articles-uncached', False)
+    cached = run("precomputed, unconditional", '/api/articles', False)
+    after = run("precomputed + If-None-Match", '/api/articles', True)
+    print(f"Speedup: {cached / before:.1f}x unconditional, {after / before:.1f}x with ETags")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark the article archive: batched insert rate, warm-start load and
+full-text search latency as the archive grows
+
+    python benchmarks/bench_archive.py [rows ...]    (default 10000 100000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from archive import Archive
+from article_record import Article
+from corpus import synthetic_entries
+
+SOURCES = ["VnExpress", "Cafef", "NDH", "Báo Đầu Tư", "VietnamPlus", "Thời Báo Tài Chính"]
+QUERIES = [
+    ("rare word", "ma 4242"),
+    ("common word", "lai suat"),
+    ("with diacritics", "lãi suất điều hành"),
+    ("prefix", "trai phi"),
+]
+
+
+def fill(archive: Archive, rows: int):
+    rng = random.Random(7)
+    entries = synthetic_entries(2000)
+    now = datetime.now()
+    for i in range(rows):
+        title, _ = entries[i % len(entries)]
+        article = Article(
+            f"{title} mã {i % 5000}",
+            f"https://example.vn/{i}.html",
+            rng.choice(SOURCES),
+            # Spread over a year, newest first
+            (now - timedelta(minutes=i * 525600 / rows)).timestamp(),
+            summary=f"{title}. Bài viết số {i}.",
+        )
+        archive.add(f"https://example.vn/{i}.html", str(i), article)
+    archive.flush()
+
+
+def timed(fn, repeat: int = 20) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print("Article archive benchmark")
+    print("=" * 60)
+
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            archive = Archive(os.path.join(directory, 'articles.sqlite3'))
+            started = time.perf_counter()
+            fill(archive, rows)
+            insert_time = time.perf_counter() - started
+            size = os.path.getsize(os.path.join(directory, 'articles.sqlite3'))
+
+            print(f"\n{rows:,} articles ({size / 2**20:.0f} MiB)")
+            print(f"  insert:     {rows / insert_time:>10,.0f} articles/s (batches of {archive.batch_size})")
+            cutoff = datetime.now() - timedelta(hours=48)
+            print(f"  warm start: {timed(lambda: archive.recent(cutoff), 5):>10.1f} ms "
+                  f"({len(archive.recent(cutoff))} articles in 48h)")
+            for label, query in QUERIES:
+                best = timed(lambda: archive.search(query, limit=20))
+                newest = timed(lambda: archive.search(query, limit=20, newest=True))
+                print(f"  search {label:<16} {best:>7.2f} ms by rank, {newest:>7.2f} ms by date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Memory and throughput of the in-memory article records at 10k, 100k and
+1M articles: compact Article records vs the dicts they replaced
+
+    python benchmarks/bench_articles.py [count ...]
+
+Both are loaded from the same JSON records, as a worker does from the
+archive or a snapshot file.
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from article_index import ArticleIndex, project
+from article_record import Article
+from corpus import synthetic_entries
+from ranking import Ranker
+from textnorm import clean_html, truncate
+
+SOURCES = ["VnExpress", "Cafef", "NDH", "Báo Đầu Tư", "VietnamPlus", "Thời Báo Tài Chính"]
+CATEGORIES = [["financial"], ["policy"], ["financial", "policy"]]
+KEYWORDS = [["lãi suất"], ["thuế", "nghị định"], ["chứng khoán"], ["đầu tư", "trái phiếu"]]
+
+
+def raw_records(count: int, now: float):
+    """JSON records as the archive stores them, generated one at a time"""
+    entries = synthetic_entries(1000)
+    for i in range(count):
+        title, summary = entries[i % len(entries)]
+        url = f"https://example.vn/tin-tuc/{i}.html"
+        source = SOURCES[i % len(SOURCES)]
+        yield json.dumps({
+            'title': f"{title} ({i})", 'url': url, 'source': source,
+            'sources': [{'source': source, 'url': url}], 'timestamp': now - i * 60,
+            'summary': truncate(clean_html(summary)), 'ai_summary': False, 'relevance': 0.0,
+            'keywords': KEYWORDS[i % len(KEYWORDS)], 'categories': CATEGORIES[i % len(CATEGORIES)],
+        }, ensure_ascii=False)
+
+
+def load_dict(raw: str):
+    """How articles were held before: a dict with a datetime"""
+    article = json.loads(raw)
+    article['timestamp'] = datetime.fromtimestamp(article['timestamp'])
+    return article
+
+
+def load_article(raw: str):
+    return Article.from_dict(json.loads(raw))
+
+
+def measure(loader, count: int):
+    """(articles, seconds to load, bytes held) for one representation"""
+    now = time.time()
+    records = list(raw_records(count, now))
+    gc.collect()
+    started = time.perf_counter()
+    articles = [loader(raw) for raw in records]
+    elapsed = time.perf_counter() - started
+    # tracemalloc slows Python down, so memory is measured on a separate load,
+    # with the records generated on the fly to keep the process small
+    del articles, records
+    gc.collect()
+    tracemalloc.start()
+    articles = [loader(raw) for raw in raw_records(count, now)]
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return articles, elapsed, held
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print("Article record benchmark")
+    print("=" * 60)
+    for count in counts:
+        dicts, dict_load, dict_bytes = measure(load_dict, count)
+        del dicts
+        articles, load, held = measure(load_article, count)
+
+        print(f"\n{count:,} articles")
+        print(f"  dicts:    {dict_bytes / 2**20:8.1f} MiB ({dict_bytes / count:5.0f} B/article), "
+              f"loaded at {count / dict_load:>9,.0f}/s")
+        print(f"  records:  {held / 2**20:8.1f} MiB ({held / count:5.0f} B/article), "
+              f"loaded at {count / load:>9,.0f}/s ({1 - held / dict_bytes:.0%} less memory)")
+        ranker = Ranker()
+        for article in articles:
+            ranker.add(article, 1.0)
+        print(f"  rank:     {timed(lambda: ranker.rank(articles)) * 1000:8.0f} ms")
+        started = time.perf_counter()
+        index = ArticleIndex(articles)
+        print(f"  index:    {(time.perf_counter() - started) * 1000:8.0f} ms")
+        page = lambda: [project(a, None) for a in index.query(limit=50, source='cafef')[0]]
+        print(f"  page:     {timed(page) * 1000:8.2f} ms for 50 articles filtered by source")
+        del articles, ranker, index
+
+
+if __name__ == "__main__":
+    main()
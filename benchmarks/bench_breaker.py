@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark refreshes while some feeds are down: dead hosts retried with
+their full timeout on every refresh vs skipped by their circuit breakers,
+with the failing feeds' last good entries served flagged stale
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ['FEED_CACHE_DIR'] = tempfile.mkdtemp()
+os.environ.setdefault('SUMMARY_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'summaries.sqlite3'))
+os.environ['ARCHIVE_PATH'] = ''
+os.environ['SNAPSHOT_PATH'] = ''
+os.environ['BODY_EXTRACTION'] = '0'
+os.environ['LLM_BACKEND'] = 'none'
+# How long a dead host holds each fetch
+os.environ.setdefault('FEED_READ_TIMEOUT', '2')
+
+import app as web
+from article_store import ArticleStore
+from dedupe import StoryIndex
+from feed_health import BREAKER_THRESHOLD, FeedHealthTracker
+from stub_server import StubServer
+
+HEALTHY = int(os.getenv('BENCH_HEALTHY_FEEDS', '8'))
+DEAD = int(os.getenv('BENCH_DEAD_FEEDS', '2'))
+GARBAGE = int(os.getenv('BENCH_GARBAGE_FEEDS', '1'))
+REFRESHES = int(os.getenv('BENCH_REFRESHES', '6'))
+
+
+def restart(tracker):
+    """A fresh process: empty store, only the feed cache on disk survives"""
+    web.article_store = ArticleStore()
+    web.story_index = StoryIndex()
+    web.parsed_feeds.clear()
+    web.feed_health = tracker
+
+
+def refresh(feeds) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        web.refresh_articles(feeds)
+        return time.perf_counter() - started
+
+
+def run(label, server, feeds, broken, tracker):
+    restart(tracker)
+    requests_before = server.httpd.broken_requests
+    times = [refresh(feeds) for _ in range(REFRESHES)]
+    hits = server.httpd.broken_requests - requests_before
+    payload = web.app.test_client().get('/api/articles').get_json()
+    stale = sum(1 for article in payload['articles'] if article.get('stale'))
+    print(f"{label:<22} " + ' '.join(f"{t:5.2f}" for t in times) +
+          f"  total {sum(times):6.2f}s, {hits:3} requests to {len(broken)} broken feeds")
+    print(f"{'':<22} {payload['count']} articles, {stale} flagged stale from "
+          f"{len(payload['stale_feeds'])} stale feeds")
+    return sum(times)
+
+
+def main():
+    print("Circuit breaker benchmark")
+    print("=" * 60)
+    with StubServer() as server:
+        names = [f"feed{i}" for i in range(HEALTHY + DEAD + GARBAGE)]
+        feeds = [server.feed_url(name, 0.05, vary=True) for name in names]
+        refresh(feeds)
+
+        broken = names[HEALTHY:]
+        for name in broken[:DEAD]:
+            server.break_feed(name, 'hang')
+        for name in broken[DEAD:]:
+            server.break_feed(name, 'garbage')
+        print(f"{HEALTHY} healthy feeds, {DEAD} hanging ({os.environ['FEED_READ_TIMEOUT']}s timeout), "
+              f"{GARBAGE} serving garbage; seconds per refresh:")
+
+        before = run("retry every refresh", server, feeds, broken,
+                     FeedHealthTracker(threshold=10**9))
+        after = run(f"breaker ({BREAKER_THRESHOLD} failures)", server, feeds, broken,
+                    FeedHealthTracker())
+        print(f"Speedup over {REFRESHES} refreshes: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
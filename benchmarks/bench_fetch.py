@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial fetching vs the refresh pipeline's concurrent fetch stage
+against a local stub server, and the refresh deadline with a feed that
+trickles its body in
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ['FEED_CACHE_DIR'] = tempfile.mkdtemp()
+os.environ['SUMMARY_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(), 'summaries.sqlite3')
+os.environ['ARCHIVE_PATH'] = ''
+os.environ['SNAPSHOT_PATH'] = ''
+os.environ['BODY_EXTRACTION'] = '0'
+os.environ['LLM_BACKEND'] = 'none'
+os.environ['FEED_FETCH_DEADLINE'] = os.getenv('BENCH_DEADLINE', '2')
+
+import app as web
+from fetcher import FETCH_DEADLINE, fetch_feed
+from stub_server import StubServer
+
+# Simulated per-feed latencies (seconds); cafef is usually the slow one
+LATENCIES = {
+    "vnexpress": 0.3,
+    "cafef": 1.2,
+    "ndh": 0.4,
+    "baodautu": 0.5,
+    "vietnamplus": 0.6,
+    "thoibaotaichinh": 0.8,
+}
+
+
+def refresh(urls):
+    """Seconds for one refresh of ``urls`` and the fetch results it saw"""
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        web.refresh_articles(urls, on_result=results.append)
+        return time.perf_counter() - started, results
+
+
+def main():
+    print("Feed fetch benchmark")
+    print("=" * 60)
+
+    with StubServer() as server:
+        urls = [server.feed_url(name, delay) for name, delay in LATENCIES.items()]
+
+        started = time.perf_counter()
+        serial = [fetch_feed(url) for url in urls]
+        serial_time = time.perf_counter() - started
+
+        concurrent_time, concurrent = refresh(urls)
+
+        # One feed sends its body a byte at a time: no read times out, the deadline must
+        server.break_feed("trickle", "trickle")
+        trickling = [server.feed_url(f"{name}-2", delay) for name, delay in LATENCIES.items()]
+        partial_time, partial = refresh(trickling + [server.feed_url("trickle")])
+
+    print(f"Sum of feed latencies:   {sum(LATENCIES.values()):.2f}s")
+    print(f"Slowest feed latency:    {max(LATENCIES.values()):.2f}s")
+    print(f"Serial fetch:            {serial_time:.2f}s ({sum(r.ok for r in serial)}/{len(serial)} ok)")
+    print(f"Refresh (concurrent):    {concurrent_time:.2f}s ({sum(r.ok for r in concurrent)}/{len(concurrent)} ok)")
+    print(f"Speedup:                 {serial_time / concurrent_time:.1f}x")
+    print(f"With a trickling feed:   {partial_time:.2f}s ({sum(r.ok for r in partial)}/{len(partial)} ok, "
+          f"deadline {FETCH_DEADLINE}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the index page under a burst of visitors: rendering the
+template on every view vs the cached, compressed page
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault('FEED_CACHE_DIR', tempfile.mkdtemp())
+os.environ.setdefault('SUMMARY_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'summaries.sqlite3'))
+os.environ['ARCHIVE_PATH'] = ''
+
+from flask import render_template
+
+import app as aggregator
+from bench_api import make_articles
+
+VISITORS = int(os.getenv('BENCH_VISITORS', '200'))
+VIEWS_PER_VISITOR = int(os.getenv('BENCH_VIEWS', '5'))
+ARTICLE_COUNT = int(os.getenv('BENCH_ARTICLES', '300'))
+
+
+@aggregator.app.route('/bench/index-uncached')
+def index_uncached():
+    """The previous implementation: render the whole template on every view"""
+    return render_template('index.html', articles=aggregator.articles,
+                           last_update=aggregator.last_update,
+                           initial={'seq': 0, 'articles': [], 'source': None, 'limit': None})
+
+
+def visit(path, conditional):
+    client = aggregator.app.test_client()
+    etag = None
+    received = 0
+    for _ in range(VIEWS_PER_VISITOR):
+        headers = {'Accept-Encoding': 'gzip'}
+        if conditional and etag:
+            headers['If-None-Match'] = etag
+        response = client.get(path, headers=headers)
+        etag = response.headers.get('ETag')
+        received += len(response.data)
+    return received
+
+
+def run(label, path, conditional=False):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        received = sum(pool.map(lambda _: visit(path, conditional), range(VISITORS)))
+    elapsed = time.perf_counter() - started
+    views = VISITORS * VIEWS_PER_VISITOR
+    print(f"{label:<34} {views / elapsed:9.0f} views/s "
+          f"{received / views / 1024:8.1f} KiB/view")
+    return views / elapsed
+
+
+def main():
+    print("Index page benchmark")
+    print("=" * 60)
+    print(f"{VISITORS} visitors x {VIEWS_PER_VISITOR} views, {ARTICLE_COUNT} articles")
+
+    aggregator.articles = make_articles(ARTICLE_COUNT)
+    aggregator.last_update = aggregator.datetime.now()
+
+    before = run("render per view", '/bench/index-uncached')
+    cached = run("cached page", '/')
+    filtered = run("cached page, ?limit=50", '/?limit=50')
+    revalidated = run("cached page + If-None-Match", '/', True)
+    print(f"Speedup: {cached / before:.1f}x cached, {revalidated / before:.1f}x with ETags "
+          f"({filtered / before:.1f}x for a 50-article page)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled keyword matcher vs the old substring loops
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from corpus import load_entries
+from keywords import KEYWORDS, _trie_pattern, normalize
+from summarizer import create_simple_summary, is_financial_news
+
+# The previous implementation, kept here as the baseline
+_OLD_FINANCIAL_KEYWORDS = [
+    'tài chính', 'kinh tế', 'ngân hàng', 'chứng khoán', 'đầu tư',
+    'GDP', 'lạm phát', 'lãi suất', 'tỷ giá', 'thị trường',
+    'chính sách', 'thuế', 'ngân sách', 'nợ công', 'xuất khẩu',
+    'nhập khẩu', 'doanh nghiệp', 'cổ phiếu', 'trái phiếu',
+    'bất động sản', 'tiền tệ', 'vốn', 'tín dụng'
+]
+_OLD_FINANCIAL_TERMS = [
+    'tăng trưởng', 'kinh tế', 'GDP', 'lạm phát', 'lãi suất', 'tỷ giá',
+    'chứng khoán', 'thị trường', 'đầu tư', 'ngân hàng', 'tài chính',
+    'chính sách', 'thuế', 'ngân sách', 'nợ công', 'xuất khẩu', 'nhập khẩu',
+    'doanh nghiệp', 'công ty', 'cổ phiếu', 'trái phiếu', 'bất động sản'
+]
+_OLD_POLICY_TERMS = [
+    'chính sách', 'luật', 'nghị định', 'thông tư', 'quyết định',
+    'chính phủ', 'bộ', 'ngành', 'cơ quan', 'quy định', 'hướng dẫn'
+]
+
+
+def old_is_financial_news(title, content=""):
+    text_to_check = (title + " " + content).lower()
+    return any(keyword in text_to_check for keyword in _OLD_FINANCIAL_KEYWORDS)
+
+
+def old_create_simple_summary(title, content=""):
+    title_lower = title.lower()
+    found_terms = [t for t in _OLD_FINANCIAL_TERMS + _OLD_POLICY_TERMS if t in title_lower]
+    if found_terms:
+        if any(term in title_lower for term in _OLD_FINANCIAL_TERMS):
+            return f"Tin tức về {', '.join(found_terms[:2])} trong lĩnh vực tài chính."
+        return f"Thông tin chính sách liên quan đến {', '.join(found_terms[:2])}."
+    return ""
+
+
+def run(label, classify, summarize, entries, rounds=5):
+    best = float('inf')
+    kept = 0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        kept = 0
+        for title, content in entries:
+            if classify(title, content):
+                kept += 1
+                summarize(title, content)
+        best = min(best, time.perf_counter() - started)
+    per_entry = best / len(entries) * 1e6
+    print(f"{label:<22} {best * 1000:8.2f} ms  {per_entry:6.2f} us/entry  kept {kept}")
+    return best
+
+
+def main():
+    print("Keyword classification benchmark")
+    print("=" * 60)
+    entries = load_entries(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
+    # The app classifies cleaned text, not raw summary HTML
+    entries = [(title, re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', '', content)).strip())
+               for title, content in entries]
+
+    old = run("substring loops", old_is_financial_news, old_create_simple_summary, entries)
+    new = run("compiled matcher", is_financial_news, create_simple_summary, entries)
+    print(f"Speedup: {old / new:.2f}x")
+
+    # Cost as the vocabulary grows (e.g. ministry and exchange terms)
+    print()
+    print("Scaling with vocabulary size (match every term in every entry)")
+    texts = [normalize(title + " " + content) for title, content in entries]
+    base_terms = [normalize(term) for term, _ in KEYWORDS]
+    for size in (len(base_terms), 200, 1000):
+        terms = base_terms + [f"{base_terms[i % len(base_terms)]} mã{i}" for i in range(size - len(base_terms))]
+        pattern = re.compile(_trie_pattern(terms) + r'\b')
+        started = time.perf_counter()
+        for text in texts:
+            [term for term in terms if term in text]
+        loop_time = time.perf_counter() - started
+        started = time.perf_counter()
+        for text in texts:
+            pattern.findall(text)
+        trie_time = time.perf_counter() - started
+        print(f"{size:5d} terms: substring loop {loop_time * 1000:8.2f} ms, "
+              f"compiled trie {trie_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the refresh pipeline: time to the first published article
+versus the whole refresh, and peak memory as the number of feeds grows
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Fresh caches outside ./.cache and no LLM calls, before the app module reads its settings
+os.environ['FEED_CACHE_DIR'] = tempfile.mkdtemp(prefix='bench-feeds-')
+os.environ['SUMMARY_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(), 'summaries.sqlite3')
+os.environ['ARCHIVE_PATH'] = os.path.join(tempfile.mkdtemp(), 'archive.sqlite3')
+os.environ['SNAPSHOT_PATH'] = ''
+os.environ.pop('OPENAI_API_KEY', None)
+os.environ['LLM_BACKEND'] = 'openai'
+
+import app as web
+from article_store import ArticleStore
+from dedupe import StoryIndex
+from stub_server import StubServer
+
+
+def reset():
+    web.article_store = ArticleStore()
+    web.story_index = StoryIndex()
+
+
+def first_publish_time(started: float, result: dict):
+    store = web.article_store
+    if store.wait_for_change(store.version, 30):
+        result['first'] = time.perf_counter() - started
+
+
+def run(feeds):
+    reset()
+    result = {}
+    started = time.perf_counter()
+    watcher = threading.Thread(target=first_publish_time, args=(started, result))
+    watcher.start()
+    articles = web.fetch_articles(feeds)
+    result['total'] = time.perf_counter() - started
+    watcher.join()
+    result['articles'] = len(articles)
+    return result
+
+
+def main():
+    print("Refresh pipeline benchmark")
+    print("=" * 60)
+
+    with StubServer() as server:
+        # One fast feed and one slow one: the fast feed's articles go out first
+        feeds = [server.feed_url("fast", 0.05), server.feed_url("slow", 1.5)]
+        result = run(feeds)
+        print(f"First article published: {result['first']:.2f}s")
+        print(f"Refresh complete:        {result['total']:.2f}s ({result['articles']} articles)")
+        for name, counters in web.last_pipeline_stats.items():
+            print(f"  {name:<10} {counters['in']:>5} in {counters['out']:>5} out "
+                  f"{counters['busy_seconds']:.3f}s busy x{counters['workers']}")
+
+        print()
+        print(f"{'Feeds':>6} {'Seconds':>8} {'Peak MiB':>9}")
+        for count in (10, 50, 200):
+            result = run([server.feed_url(f"time{count}-{i}") for i in range(count)])
+            # tracemalloc slows Python down, so memory is measured on a separate run
+            tracemalloc.start()
+            run([server.feed_url(f"memory{count}-{i}") for i in range(count)])
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{count:>6} {result['total']:>8.2f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
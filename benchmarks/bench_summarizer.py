@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark the summarizer backends for latency and throughput: the
+rule-based phrases, the extractive model one article at a time and over
+whole batches, and an LLM round trip (the stub backend sleeping
+BENCH_LLM_LATENCY seconds, standing in for the OpenAI API)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+os.environ.setdefault('SUMMARY_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'summaries.sqlite3'))
+os.environ['LLM_BACKEND'] = 'stub'
+os.environ['LLM_STUB_LATENCY'] = os.getenv('BENCH_LLM_LATENCY', '0.6')
+
+from corpus import load_entries
+from extractive import ExtractiveSummarizer
+from summarizer import SUMMARIZER_BATCH_SIZE, create_simple_summary, stub_llm_summary
+from textnorm import clean_html
+
+ARTICLES = int(os.getenv('BENCH_ARTICLES', '2000'))
+# Feed summaries joined into article-length bodies, as with BODY_EXTRACTION=1
+BODY_SUMMARIES = int(os.getenv('BENCH_BODY_SUMMARIES', '8'))
+LLM_CALLS = int(os.getenv('BENCH_LLM_CALLS', '10'))
+
+
+def articles_with_bodies(entries):
+    rng = random.Random(7)
+    texts = [text for _, text in entries if text]
+    return [(title, ' '.join([text] + rng.sample(texts, BODY_SUMMARIES - 1)))
+            for title, text in entries]
+
+
+def run(label, summarize, articles, batch):
+    """Summarize ``articles`` in calls of ``batch``; prints ms/article and articles/s"""
+    started = time.perf_counter()
+    summaries = []
+    for i in range(0, len(articles), batch):
+        summaries.extend(summarize(articles[i:i + batch]))
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<34} {elapsed / len(articles) * 1000:9.3f} ms/article "
+          f"{len(articles) / elapsed:>10,.0f} articles/s")
+    return summaries
+
+
+def main():
+    print("Summarizer benchmark")
+    print("=" * 60)
+    entries = [(title, clean_html(summary)) for title, summary in load_entries(ARTICLES)[:ARTICLES]]
+    simple = lambda batch: [create_simple_summary(title, text) for title, text in batch]
+
+    for name, articles in (("feed summaries", entries),
+                           (f"bodies of {BODY_SUMMARIES} summaries", articles_with_bodies(entries))):
+        print(f"\n{len(articles)} articles, {name}:")
+        run("rule-based phrases", simple, articles, len(articles))
+        run("extractive, one per call", ExtractiveSummarizer().summarize, articles, 1)
+        run(f"extractive, batches of {SUMMARIZER_BATCH_SIZE}", ExtractiveSummarizer().summarize,
+            articles, SUMMARIZER_BATCH_SIZE)
+        extracted = run("extractive, whole batch", ExtractiveSummarizer().summarize, articles, len(articles))
+        title, _ = articles[0]
+        print(f"  e.g. {title}\n    => {extracted[0]}")
+
+    llm = lambda batch: [stub_llm_summary(title, text) for title, text in batch]
+    print()
+    run(f"LLM round trip ({os.environ['LLM_STUB_LATENCY']}s stub)", llm, entries[:LLM_CALLS], 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: textnorm.clean_html vs the old two-regex clean_text
+"""
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from corpus import load_entries
+from textnorm import clean_html, truncate
+
+
+def old_clean_text(text):
+    """The previous implementation, kept here as the baseline"""
+    if not text:
+        return ""
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def bench(fn, fields, rounds: int = 5) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for field in fields:
+            fn(field)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    entries = load_entries(20000)
+    fields = [field for entry in entries for field in entry]
+    print("Text cleaning benchmark")
+    print("=" * 60)
+
+    old = bench(old_clean_text, fields)
+    new = bench(clean_html, fields)
+    print(f"{len(fields)} title/summary fields")
+    print(f"old clean_text:  {old * 1e6 / len(fields):6.2f} us/field")
+    print(f"clean_html:      {new * 1e6 / len(fields):6.2f} us/field ({old / new:.2f}x)")
+    summaries = [clean_html(summary) for _, summary in entries]
+    cut = bench(truncate, summaries)
+    print(f"truncate:        {cut * 1e6 / len(summaries):6.2f} us/summary")
+
+    # What the old version got wrong on this corpus
+    entities = sum('&' in old_clean_text(f) for f in fields)
+    images_only = sum(bool(clean_html(f)) and not old_clean_text(f) for f in fields)
+    print(f"\nFields with undecoded entities before: {entities}")
+    print(f"Image-only fields that were empty before: {images_only}")
+
+
+if __name__ == "__main__":
+    main()
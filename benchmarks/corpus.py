@@ -0,0 +1,68 @@
+"""
+Headline/summary corpus for benchmarks: recorded feed payloads when
+available, otherwise a synthetic Vietnamese corpus
+"""
+
+import glob
+import os
+import random
+from typing import List, Tuple
+
+import feedparser
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+_SUBJECTS = [
+    "Ngân hàng Nhà nước", "Bộ Tài chính", "Chính phủ", "Cafef", "Doanh nghiệp FDI",
+    "Nhà đầu tư ngoại", "Đội tuyển Việt Nam", "Ca sĩ", "Hà Nội", "TP.HCM",
+    "Quốc hội", "Vietcombank", "Giá xăng", "Thời tiết miền Bắc", "Học sinh",
+]
+_VERBS = [
+    "điều chỉnh", "công bố", "ban hành", "giảm mạnh", "tăng nhẹ", "chuẩn bị",
+    "đề xuất", "thắng đậm", "khai mạc", "cảnh báo",
+]
+_OBJECTS = [
+    "lãi suất điều hành", "nghị định mới về thuế", "gói tín dụng 120.000 tỷ đồng",
+    "kết quả kinh doanh quý III", "trận chung kết", "lịch nghỉ Tết",
+    "chỉ số VN-Index", "giá vàng SJC", "kế hoạch đầu tư công", "triển lãm nghệ thuật",
+    "tỷ giá trung tâm", "quy định về trái phiếu doanh nghiệp", "mưa lớn diện rộng",
+    "chương trình học mới", "xuất khẩu gạo",
+]
+
+
+def recorded_entries() -> List[Tuple[str, str]]:
+    """(title, raw summary HTML) pairs from every recorded feed fixture"""
+    entries = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.xml'))):
+        with open(path, 'rb') as f:
+            feed = feedparser.parse(f.read())
+        entries.extend((e.get('title', ''), e.get('summary', '')) for e in feed.entries)
+    return entries
+
+
+def synthetic_entries(count: int, seed: int = 42) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(count):
+        title = f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}"
+        summary = (f'<p><a href="https://example.vn/{rng.randint(1, 10**6)}.html">'
+                   f'<img src="https://example.vn/{rng.randint(1, 10**6)}.jpg" /></a>'
+                   f'{title}. Theo {rng.choice(_SUBJECTS)}, {rng.choice(_OBJECTS)} '
+                   f'&amp; {rng.choice(_OBJECTS)} s&#7869; {rng.choice(_VERBS)} trong tháng tới.</p>')
+        if rng.random() < 0.1:
+            # Some outlets publish a summary that is only the lead image
+            summary = (f'<a href="https://example.vn/{rng.randint(1, 10**6)}.html">'
+                       f'<img src="https://example.vn/{rng.randint(1, 10**6)}.jpg" alt="{title}" /></a>')
+        entries.append((title, summary))
+    return entries
+
+
+def load_entries(count: int = 5000) -> List[Tuple[str, str]]:
+    """At least ``count`` entries, recorded ones first"""
+    entries = recorded_entries()
+    source = 'recorded fixtures' if entries else 'synthetic corpus'
+    if len(entries) < count:
+        # Repeat recorded entries, or synthesize when nothing was recorded
+        entries = (entries * (count // len(entries) + 1))[:count] if entries else synthetic_entries(count)
+    print(f"Corpus: {len(entries)} entries from {source}")
+    return entries
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Record the live payload of every configured feed into benchmarks/fixtures,
+so benchmarks can replay real RSS offline
+
+    python benchmarks/record_feeds.py [feeds.json]
+"""
+
+import os
+import re
+import sys
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import requests
+
+from corpus import FIXTURES_DIR
+from feed_registry import FEEDS_CONFIG, FeedRegistry
+from fetcher import USER_AGENT
+
+
+def fixture_name(url: str) -> str:
+    """File name for a feed: host and path, e.g. vnexpress.net-rss-kinh-doanh.rss"""
+    parsed = urlparse(url)
+    host = parsed.netloc.removeprefix('www.')
+    return re.sub(r'[^A-Za-z0-9.]+', '-', f"{host}{parsed.path}").strip('-')
+
+
+def main():
+    registry = FeedRegistry.load(sys.argv[1] if len(sys.argv) > 1 else FEEDS_CONFIG)
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    recorded = 0
+    for url in registry.urls():
+        try:
+            response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=20)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Skipping {url}: {e}")
+            continue
+        path = os.path.join(FIXTURES_DIR, fixture_name(url) + '.xml')
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        recorded += 1
+        print(f"{url} -> {os.path.relpath(path)} ({len(response.content) / 1024:.0f} KiB)")
+    print(f"Recorded {recorded} of {len(registry.urls())} feeds")
+
+
+if __name__ == "__main__":
+    main()
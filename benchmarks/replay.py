@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+End-to-end refresh benchmark over replayed feeds, fully offline.
+
+Recorded payloads in benchmarks/fixtures (see record_feeds.py) are served
+by the local stub server, or synthetic feeds when nothing was recorded,
+with configurable latency, error rate and feed size. LLM summaries come
+from the stub backend. Reports refresh wall time, per-stage timings,
+articles/sec, peak memory and /api/articles throughput.
+
+    python benchmarks/replay.py --latency 0.3 --error-rate 0.05 --save before.json
+    python benchmarks/replay.py --compare before.json    (exits 1 on a regression)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--synthetic', type=int, metavar='FEEDS', default=0,
+                        help='replay this many synthetic feeds instead of the recorded fixtures')
+    parser.add_argument('--items', type=int, default=20, help='entries per synthetic feed')
+    parser.add_argument('--size', type=int, default=0, help='bytes of description per synthetic entry')
+    parser.add_argument('--latency', type=float, default=0.2, help='seconds before each feed responds')
+    parser.add_argument('--jitter', type=float, default=0.3, help='random extra latency, up to this')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of feed requests failing')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='seconds per stub LLM summary')
+    parser.add_argument('--clients', type=int, default=50, help='concurrent /api/articles pollers')
+    parser.add_argument('--polls', type=int, default=20, help='requests per poller')
+    parser.add_argument('--verbose', action='store_true', help="show the app's own log lines")
+    parser.add_argument('--save', metavar='PATH', help='write the results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='compare with results saved earlier')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='relative slowdown reported as a regression')
+    return parser.parse_args()
+
+
+args = parse_args()
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Throwaway state and a stub LLM, before the app modules read their settings
+workdir = tempfile.mkdtemp(prefix='bench-replay-')
+os.environ['FEED_CACHE_DIR'] = os.path.join(workdir, 'feeds')
+os.environ['SUMMARY_CACHE_PATH'] = os.path.join(workdir, 'summaries.sqlite3')
+os.environ['ARCHIVE_PATH'] = os.path.join(workdir, 'articles.sqlite3')
+os.environ['SNAPSHOT_PATH'] = ''
+os.environ['BODY_EXTRACTION'] = '0'
+os.environ['LLM_BACKEND'] = 'stub'
+os.environ['LLM_STUB_LATENCY'] = str(args.llm_latency)
+os.environ['LLM_REQUESTS_PER_MINUTE'] = '1000000'
+os.environ['LLM_TOKENS_PER_MINUTE'] = '1000000000'
+
+import app as web
+from article_store import ArticleStore
+from dedupe import StoryIndex
+from stub_server import StubServer, fixture_names
+
+# Metric -> True when higher is better
+METRICS = {
+    'refresh_seconds': False,
+    'entries_per_second': True,
+    'unchanged_refresh_seconds': False,
+    'llm_drain_seconds': False,
+    'peak_memory_mib': False,
+    'api_requests_per_second': True,
+    'api_conditional_requests_per_second': True,
+}
+
+
+def feed_urls(server, run: str):
+    """Feed URLs for one run; a new ``run`` misses the feed cache"""
+    options = dict(jitter=args.jitter, error=args.error_rate, run=run)
+    if args.synthetic:
+        return [server.feed_url(f"feed{i}", args.latency, args.items, vary=True, size=args.size, **options)
+                for i in range(args.synthetic)]
+    return [server.fixture_url(name, args.latency, **options) for name in fixture_names()]
+
+
+def reset():
+    web.article_store = ArticleStore(on_change=web.archive.add)
+    web.story_index = StoryIndex()
+
+
+def refresh(feeds) -> float:
+    log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with log:
+        started = time.perf_counter()
+        web.refresh_articles(feeds)
+        return time.perf_counter() - started
+
+
+def wait_for_llm(timeout: float = 300) -> float:
+    started = time.perf_counter()
+    while web.summary_worker.stats()['pending'] and time.perf_counter() - started < timeout:
+        time.sleep(0.01)
+    return time.perf_counter() - started
+
+
+def poll(conditional: bool) -> int:
+    client = web.app.test_client()
+    etag = None
+    for _ in range(args.polls):
+        headers = {'Accept-Encoding': 'gzip'}
+        if conditional and etag:
+            headers['If-None-Match'] = etag
+        etag = client.get('/api/articles', headers=headers).headers.get('ETag')
+    return args.polls
+
+
+def api_throughput(conditional: bool) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(args.clients, 32)) as pool:
+        made = sum(pool.map(lambda _: poll(conditional), range(args.clients)))
+    return made / (time.perf_counter() - started)
+
+
+def workload():
+    """The options that shape the measured work, saved with the results"""
+    ignored = {'verbose', 'save', 'compare', 'tolerance'}
+    return {key: value for key, value in vars(args).items() if key not in ignored}
+
+
+def compare(results, path: str) -> bool:
+    """Print changes against saved results; False if anything regressed"""
+    with open(path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {path} (tolerance {args.tolerance:.0%})")
+    if baseline.get('workload') != results['workload']:
+        print(f"  Warning: different workload, saved with {baseline.get('workload')}")
+    ok = True
+    for name, higher_is_better in METRICS.items():
+        before, after = baseline.get(name), results[name]
+        if not before:
+            continue
+        change = after / before - 1
+        worse = -change if higher_is_better else change
+        flag = 'REGRESSION' if worse > args.tolerance else ''
+        ok = ok and not flag
+        print(f"  {name:<38} {before:>10.2f} -> {after:>10.2f} ({change:+.0%}) {flag}")
+    return ok
+
+
+def main():
+    print("Replay benchmark")
+    print("=" * 60)
+    with StubServer() as server:
+        feeds = feed_urls(server, 'cold')
+        if not feeds:
+            sys.exit("No recorded fixtures; run record_feeds.py or pass --synthetic N")
+        kind = f"{args.synthetic} synthetic" if args.synthetic else f"{len(feeds)} recorded"
+        print(f"{kind} feeds, latency {args.latency}s +{args.jitter}s, "
+              f"error rate {args.error_rate:.0%}, LLM {args.llm_latency}s/summary")
+
+        reset()
+        cold = refresh(feeds)
+        stages = web.last_pipeline_stats
+        entries = stages['entries']['out']
+        llm_drain = wait_for_llm()
+        warm = refresh(feeds)
+
+        # tracemalloc slows Python down, so memory is measured on a separate run
+        reset()
+        tracemalloc.start()
+        refresh(feed_urls(server, 'memory'))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        wait_for_llm()
+
+        results = {
+            'workload': workload(),
+            'feeds': len(feeds),
+            'entries': entries,
+            'articles': len(web.articles),
+            'feed_errors': server.httpd.errors,
+            'refresh_seconds': cold,
+            'entries_per_second': entries / cold,
+            'unchanged_refresh_seconds': warm,
+            'llm_drain_seconds': llm_drain,
+            'llm_summaries': web.summary_worker.stats()['completed'],
+            'peak_memory_mib': peak / 2**20,
+            'api_requests_per_second': api_throughput(False),
+            'api_conditional_requests_per_second': api_throughput(True),
+            'stages': stages,
+        }
+
+    print(f"\nRefresh:            {cold:8.2f}s  {entries} entries, {results['articles']} articles "
+          f"({results['entries_per_second']:.0f} entries/s), {results['feed_errors']} feed errors")
+    print(f"Unchanged refresh:  {warm:8.2f}s")
+    print(f"LLM queue drained:  {llm_drain:8.2f}s after the refresh "
+          f"({results['llm_summaries']} summaries)")
+    print(f"Peak memory:        {results['peak_memory_mib']:8.1f} MiB")
+    print(f"/api/articles:      {results['api_requests_per_second']:8.0f} req/s, "
+          f"{results['api_conditional_requests_per_second']:.0f} req/s with If-None-Match")
+    print("\nStages (cold refresh):")
+    for name, counters in stages.items():
+        print(f"  {name:<10} {counters['in']:>6} in {counters['out']:>6} out "
+              f"{counters['errors']:>4} errors {counters['busy_seconds']:8.3f}s busy x{counters['workers']}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+    if args.compare and not compare(results, args.compare):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Local stub HTTP server that serves synthetic or recorded RSS feeds for
+benchmarks, with configurable latency, error rate and feed size
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+import zlib
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from corpus import FIXTURES_DIR, synthetic_entries
+
+HEADLINES = [
+    "Ngân hàng Nhà nước điều chỉnh lãi suất điều hành",
+    "Thị trường chứng khoán phục hồi mạnh phiên cuối tuần",
+    "Xuất khẩu nông sản tăng trưởng hai con số",
+    "Chính phủ ban hành nghị định mới về thuế thu nhập doanh nghiệp",
+    "Giá vàng trong nước biến động theo tỷ giá",
+    "Doanh nghiệp bất động sản đẩy mạnh phát hành trái phiếu",
+    "Lạm phát được kiểm soát dưới mục tiêu của Quốc hội",
+    "Vốn đầu tư nước ngoài giải ngân đạt kỷ lục",
+]
+
+
+def make_rss(name: str, items: int = 20, now: float = None, vary: bool = False,
+             size: int = 0) -> bytes:
+    """
+    Build an RSS 2.0 document with ``items`` entries.
+
+    By default titles cycle through HEADLINES, so most entries fold into
+    a few stories; ``vary`` draws distinct stories from the synthetic
+    corpus instead (the same ones for the same ``name``). ``size`` pads
+    each description to about that many bytes.
+    """
+    now = now or time.time()
+    stories = synthetic_entries(items, seed=zlib.crc32(name.encode())) if vary else None
+    entries = []
+    for i in range(items):
+        if stories:
+            title, summary = stories[i]
+        else:
+            title = f"{HEADLINES[i % len(HEADLINES)]} ({name} #{i})"
+            summary = f"<p>{title}. Nội dung tin tức tài chính.</p>"
+        if size > len(summary):
+            summary += "<p>" + "Nội dung chi tiết. " * ((size - len(summary)) // 20 + 1) + "</p>"
+        entries.append(
+            "<item>"
+            f"<title>{title}</title>"
+            f"<link>http://{name}.example/bai-viet/{i}.html</link>"
+            f"<guid>http://{name}.example/bai-viet/{i}.html</guid>"
+            f"<description><![CDATA[{summary}]]></description>"
+            f"<pubDate>{formatdate(now - i * 600)}</pubDate>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<rss version="2.0"><channel><title>{name}</title>'
+        + "".join(entries)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def fixture_names():
+    """Names of the recorded feeds in benchmarks/fixtures"""
+    if not os.path.isdir(FIXTURES_DIR):
+        return []
+    return sorted(name[:-4] for name in os.listdir(FIXTURES_DIR) if name.endswith('.xml'))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Serves /feed/<name> (synthetic) and /fixture/<name> (recorded), honouring
+    If-None-Match. Query parameters: delay and jitter (seconds), error (the
+    probability of answering 500), items, vary and size (see make_rss).
+    Feeds switched off with StubServer.break_feed hang, trickle their body
+or answer garbage.
+    """
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        param = lambda key, default: params.get(key, [default])[0]
+        kind, _, name = parsed.path.strip("/").partition("/")
+        name = name or "feed"
+
+        broken = self.server.broken.get(name)
+        if broken:
+            self.server.broken_requests += 1
+            if broken == "hang":
+                time.sleep(self.server.hang_seconds)
+                return
+            if broken == "trickle":
+                # Headers at once, then one byte at a time: no single read times out
+                body = make_rss(name)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for i in range(len(body)):
+                    self.wfile.write(body[i:i + 1])
+                    self.wfile.flush()
+                    time.sleep(self.server.trickle_seconds)
+                return
+            body = b"<html><body>Service Unavailable</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        delay = float(param("delay", "0")) + random.uniform(0, float(param("jitter", "0")))
+        if delay:
+            time.sleep(delay)
+        if random.random() < float(param("error", "0")):
+            self.server.errors += 1
+            self.send_error(500)
+            return
+
+        if kind == "fixture":
+            try:
+                with open(os.path.join(FIXTURES_DIR, os.path.basename(name) + ".xml"), "rb") as f:
+                    body = f.read()
+            except OSError:
+                self.send_error(404)
+                return
+        else:
+            body = make_rss(name, int(param("items", "20")), self.server.started,
+                            vary=param("vary", "0") == "1", size=int(param("size", "0")))
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        self.server.requests += 1
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.server.full_responses += 1
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """Run the stub feed server on a background thread"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.started = time.time()
+        self.httpd.requests = 0
+        self.httpd.full_responses = 0
+        self.httpd.errors = 0
+        # Feed name -> "hang", "trickle" or "garbage", and requests those feeds received
+        self.httpd.broken = {}
+        self.httpd.broken_requests = 0
+        self.httpd.hang_seconds = 60
+        self.httpd.trickle_seconds = 0.5
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_url(self, name: str, delay: float = 0.0, items: int = 20, **options) -> str:
+        """URL of a synthetic feed; ``options`` are jitter, error, vary and size"""
+        query = dict(delay=delay, items=items, **{key: int(value) if isinstance(value, bool) else value
+                                                   for key, value in options.items()})
+        return f"{self.base_url}/feed/{name}?{urlencode(query)}"
+
+    def fixture_url(self, name: str, delay: float = 0.0, **options) -> str:
+        """URL replaying benchmarks/fixtures/<name>.xml; ``options`` are jitter and error"""
+        return f"{self.base_url}/fixture/{name}?{urlencode(dict(delay=delay, **options))}"
+
+    def break_feed(self, name: str, mode: str = "hang"):
+        """
+        Make a feed hang without answering, send its body a byte at a time
+        ("trickle"), or answer an HTML error page ("garbage")
+        """
+        self.httpd.broken[name] = mode
+
+    def restore_feed(self, name: str):
+        self.httpd.broken.pop(name, None)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,132 @@
+"""
+Cross-source near-duplicate detection with MinHash signatures and LSH.
+
+Text is folded to unaccented lowercase syllables and shingled into
+syllable bigrams. A MinHash signature approximates Jaccard similarity
+between shingle sets, and banded locality-sensitive hashing finds
+candidate duplicates without comparing against every stored story.
+A candidate only counts as the same story when another outlet published
+it within DUPLICATE_WINDOW_HOURS: one outlet's daily template stories
+("Tỷ giá USD hôm nay 15/10", "... 16/10") share most of their wording
+but are different stories.
+"""
+
+import os
+import threading
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+DUPLICATE_THRESHOLD = float(os.getenv('DUPLICATE_THRESHOLD', '0.5'))
+# Reprints further apart in publication time than this are separate stories
+DUPLICATE_WINDOW_HOURS = float(os.getenv('DUPLICATE_WINDOW_HOURS', '24'))
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+
+def fold(text: str) -> List[str]:
+    """Lowercase, strip Vietnamese diacritics and split into syllables"""
+    text = unicodedata.normalize('NFD', text.lower()).replace('đ', 'd')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ''.join(c if c.isalnum() else ' ' for c in text).split()
+
+
+def shingles(text: str) -> Set[str]:
+    """Syllable bigrams (single syllables for one-word texts)"""
+    tokens = fold(text)
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f'{a} {b}' for a, b in zip(tokens, tokens[1:])}
+
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of ``text``'s shingles, or None for empty text"""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams),
+                         dtype=np.uint64, count=len(grams))
+    # (a*x + b) mod p for every permutation at once: shingles x permutations
+    permuted = (hashes[:, None] * _A[None, :] + _B[None, :]) % _MERSENNE_PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / NUM_PERMUTATIONS
+
+
+class StoryIndex:
+    """LSH index of representative stories; duplicates resolve to them"""
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD,
+                 window_hours: float = DUPLICATE_WINDOW_HOURS):
+        self.threshold = threshold
+        self.window = window_hours * 3600
+        self._signatures: Dict[str, np.ndarray] = {}
+        # Key -> (source, publication epoch seconds) of each story
+        self._stories: Dict[str, Tuple[str, int]] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def _bands(signature: np.ndarray):
+        for band in range(LSH_BANDS):
+            yield band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+
+    def find(self, signature: np.ndarray, source: str, timestamp: int,
+             exclude: Optional[str] = None) -> Optional[str]:
+        """
+        Key of the most similar indexed story above the threshold from
+        another source, published within the window of ``timestamp``
+        """
+        with self._lock:
+            candidates = set()
+            for band in self._bands(signature):
+                candidates.update(self._buckets.get(band, ()))
+            candidates.discard(exclude)
+            best_key, best_score = None, self.threshold
+            for key in candidates:
+                story_source, story_timestamp = self._stories[key]
+                if story_source == source or abs(story_timestamp - timestamp) > self.window:
+                    continue
+                score = similarity(signature, self._signatures[key])
+                if score >= best_score:
+                    best_key, best_score = key, score
+            return best_key
+
+    def add(self, key: str, signature: np.ndarray, source: str, timestamp: int):
+        with self._lock:
+            self._remove(key)
+            self._signatures[key] = signature
+            self._stories[key] = (source, int(timestamp))
+            for band in self._bands(signature):
+                self._buckets[band].add(key)
+
+    def _remove(self, key: str):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        del self._stories[key]
+        for band in self._bands(signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove(key)
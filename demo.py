@@ -4,7 +4,8 @@ Demo script to show the Vietnamese Finance News Aggregator working
 """
 
 import time
-from app import fetch_articles, summarize_article
+from app import fetch_articles
+from summarizer import summarize_article
 
 def main():
     print("Vietnamese Finance News Aggregator - Demo")
@@ -18,13 +19,13 @@ def main():
     print("-" * 60)
     
     for i, article in enumerate(articles[:5], 1):
-        print(f"\n{i}. {article['title']}")
-        print(f"   Source: {article['source']}")
-        print(f"   Time: {article['timestamp'].strftime('%d/%m/%Y %H:%M')}")
-        print(f"   URL: {article['url']}")
+        print(f"\n{i}. {article.title}")
+        print(f"   Source: {article.source}")
+        print(f"   Time: {article.published.strftime('%d/%m/%Y %H:%M')}")
+        print(f"   URL: {article.url}")
         
-        if article['summary']:
-            print(f"   Summary: {article['summary']}")
+        if article.summary:
+            print(f"   Summary: {article.summary}")
         
         print("-" * 60)
     
@@ -34,7 +35,7 @@ def main():
     # Count by source
     sources = {}
     for article in articles:
-        source = article['source']
+        source = article.source
         sources[source] = sources.get(source, 0) + 1
     
     print(f"   Articles by source:")
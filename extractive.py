@@ -0,0 +1,168 @@
+"""
+Extractive summaries: each article's key sentence, picked locally with
+TF-IDF and TextRank over Vietnamese syllable unigrams and bigrams.
+
+A batch of articles is vectorized at once. Every sentence (and title)
+becomes a row of one sparse TF-IDF matrix, kept as NumPy coordinate
+arrays over hashed features. Document frequencies accumulate over every
+batch summarized so far. Sentence similarities within each article and
+TextRank then run for the whole batch as stacked matrices. A sentence's
+score blends its TextRank centrality, its similarity to the title and
+how early it comes. The best sentence that does not merely repeat the
+title is the summary.
+"""
+
+import re
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from keywords import normalize
+
+# Sentences considered per article; news puts the substance up front
+MAX_SENTENCES = 24
+# Sentences shorter than this many syllables are not used as summaries
+MIN_SYLLABLES = 6
+# Similarity to the title above which a sentence only repeats it
+TITLE_REPEAT = 0.8
+DAMPING = 0.85
+ITERATIONS = 30
+# Score weights: TextRank centrality, similarity to the title, lead position
+WEIGHTS = (0.5, 0.3, 0.2)
+
+_FEATURE_BITS = 18
+_FEATURE_MASK = (1 << _FEATURE_BITS) - 1
+
+_BOUNDARY = re.compile(r'[.!?…]+["”’)\]]*\s+')
+_SYLLABLE = re.compile(r'\w+')
+# Abbreviations ending in a dot that do not end a sentence ("TP. HCM", "TS. Lê")
+_ABBREVIATIONS = frozenset({'tp', 'tt', 'ts', 'ths', 'pgs', 'gs', 'bs', 'ks', 'ls', 'nxb', 'mr', 'ms', 'dr', 'st'})
+# Vietnamese function syllables that say nothing about the story
+STOPWORDS = frozenset("""
+    à ạ ai anh bị bởi các cả cái cần chỉ cho chứ chưa có còn của cùng cũng đã đang
+    đây đó được để đến đều gì hay hơn khi không là lại lên lúc mà mới một nào này
+    nên nếu ngày người nhiều như nhưng những nơi ở ông qua ra rằng rất rồi sau sẽ
+    so sự tại thì theo thế tới trên trong từ và vào vẫn về vì với vừa
+""".split())
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences of ``text``, not breaking at abbreviations, initials or decimals"""
+    sentences = []
+    start = 0
+    for boundary in _BOUNDARY.finditer(text):
+        end = boundary.end()
+        if end < len(text) and text[end].islower():
+            continue
+        words = text[max(start, boundary.start() - 8):boundary.start()].rsplit(None, 1)
+        last = words[-1].lower() if words else ''
+        if text[boundary.start()] == '.' and ((len(last) == 1 and last.isalpha()) or last in _ABBREVIATIONS):
+            continue
+        sentence = text[start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = end
+    rest = text[start:].strip()
+    if rest:
+        sentences.append(rest)
+    return sentences
+
+
+def syllables(text: str) -> List[str]:
+    """Lowercased NFC syllables of ``text``, punctuation dropped"""
+    return _SYLLABLE.findall(normalize(text))
+
+
+def features(tokens: List[str]) -> List[int]:
+    """Hashed syllable unigrams (minus stopwords) and bigrams"""
+    hashed = [hash(s) & _FEATURE_MASK for s in tokens if s not in STOPWORDS]
+    hashed += [hash((a, b)) & _FEATURE_MASK for a, b in zip(tokens, tokens[1:])
+               if not (a in STOPWORDS and b in STOPWORDS)]
+    return hashed
+
+
+class ExtractiveSummarizer:
+    """Picks a summary sentence per article; safe to share between threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Articles containing each hashed feature, over every batch so far
+        self._df = np.zeros(1 << _FEATURE_BITS, dtype=np.float64)
+        self._documents = 0
+
+    def _idf(self, article_of_entry: np.ndarray, cols: np.ndarray, articles: int) -> np.ndarray:
+        """Inverse document frequency of each entry's feature, counting this batch in"""
+        present = np.unique(article_of_entry.astype(np.int64) << _FEATURE_BITS | cols) & _FEATURE_MASK
+        with self._lock:
+            np.add.at(self._df, present, 1)
+            self._documents += articles
+            return np.log((1 + self._documents) / (1 + self._df[cols])) + 1
+
+    def summarize(self, articles: Sequence[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        The summary sentence of each (title, plain text) article, or None
+        when the text has no sentence beyond a repeat of the title.
+        """
+        if not articles:
+            return []
+        # Row 0 of every article is its title, then up to MAX_SENTENCES sentences
+        sentences = [split_sentences(text)[:MAX_SENTENCES] for _, text in articles]
+        width = 1 + max(len(s) for s in sentences)
+        if width == 1:
+            return [None] * len(articles)
+        rows, cols, lengths = [], [], np.zeros((len(articles), width), dtype=np.int64)
+        for a, ((title, _), article_sentences) in enumerate(zip(articles, sentences)):
+            for i, sentence in enumerate([title] + article_sentences):
+                tokens = syllables(sentence)
+                hashed = features(tokens)
+                rows.extend([a * width + i] * len(hashed))
+                cols.extend(hashed)
+                lengths[a, i] = len(tokens)
+        if not cols:
+            return [None] * len(articles)
+
+        # Sparse TF-IDF: one entry per (row, feature), sublinear term frequency
+        keys, tf = np.unique(np.array(rows, dtype=np.int64) << _FEATURE_BITS | np.array(cols, dtype=np.int64),
+                             return_counts=True)
+        row, col = keys >> _FEATURE_BITS, keys & _FEATURE_MASK
+        article = row // width
+        weight = (1 + np.log(tf)) * self._idf(article, col, len(articles))
+        norms = np.sqrt(np.bincount(row, weight ** 2, minlength=len(articles) * width))
+        weight /= norms[row]
+
+        # Cosine similarity of every pair of rows of the same article: pair up
+        # the entries sharing a feature within an article, then sum per row pair
+        order = np.argsort(article << _FEATURE_BITS | col, kind='stable')
+        group_key = (article << _FEATURE_BITS | col)[order]
+        starts = np.flatnonzero(np.r_[True, group_key[1:] != group_key[:-1]])
+        sizes = np.diff(np.r_[starts, len(order)])
+        size_of = np.repeat(sizes, sizes)
+        left = np.repeat(np.arange(len(order)), size_of)
+        offsets = np.arange(len(left)) - np.repeat(np.cumsum(size_of) - size_of, size_of)
+        right = np.repeat(np.repeat(starts, sizes), size_of) + offsets
+        left, right = order[left], order[right]
+        pair = (article[left] * width + row[left] % width) * width + row[right] % width
+        similarity = np.bincount(pair, weight[left] * weight[right],
+                                 minlength=len(articles) * width * width).reshape(len(articles), width, width)
+
+        # TextRank over each article's sentences (rows 1..n), all articles at once
+        counts = np.array([len(s) for s in sentences])
+        valid = np.arange(1, width)[None, :] <= counts[:, None]
+        graph = similarity[:, 1:, 1:] * (1 - np.eye(width - 1))
+        out_weight = graph.sum(axis=2, keepdims=True)
+        transition = np.divide(graph, out_weight, out=np.zeros_like(graph), where=out_weight > 0)
+        rank = valid / np.maximum(counts, 1)[:, None]
+        for _ in range(ITERATIONS):
+            rank = ((1 - DAMPING) / np.maximum(counts, 1))[:, None] * valid + \
+                DAMPING * np.einsum('aij,ai->aj', transition, rank)
+        centrality = rank / np.maximum(rank.max(axis=1, keepdims=True), 1e-12)
+        to_title = similarity[:, 0, 1:]
+        lead = 1 / np.arange(1, width)
+        score = WEIGHTS[0] * centrality + WEIGHTS[1] * to_title + WEIGHTS[2] * lead[None, :]
+
+        usable = valid & (to_title < TITLE_REPEAT) & (lengths[:, 1:] >= MIN_SYLLABLES)
+        score = np.where(usable, score, -np.inf)
+        best = score.argmax(axis=1)
+        return [article_sentences[i] if usable[a, i] else None
+                for a, (i, article_sentences) in enumerate(zip(best, sentences))]
@@ -0,0 +1,226 @@
+"""
+Optional full-text extraction of article pages (BODY_EXTRACTION=1).
+
+Pages are downloaded through one keep-alive requests.Session whose
+connection pools cap concurrent connections per host, and the main text
+is picked out with a readability-style scan built on html.parser:
+paragraphs are credited to their enclosing containers and the container
+holding the most non-link paragraph text wins. Extracted bodies are
+cached by URL in SQLite, so an article is only downloaded once.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fetcher import USER_AGENT
+
+BODY_EXTRACTION = os.getenv('BODY_EXTRACTION', '0').lower() in ('1', 'true', 'yes')
+EXTRACT_WORKERS = int(os.getenv('EXTRACT_WORKERS', '16'))
+EXTRACT_PER_HOST = int(os.getenv('EXTRACT_PER_HOST', '4'))
+EXTRACT_TIMEOUT = float(os.getenv('EXTRACT_TIMEOUT', '10'))
+EXTRACT_CACHE_PATH = os.getenv('EXTRACT_CACHE_PATH', os.path.join('.cache', 'bodies.sqlite3'))
+# Failed pages are retried after this long
+EXTRACT_RETRY_SECONDS = 3600
+# Bodies kept in memory when the cache has no disk tier
+MEMORY_ENTRIES = 5000
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+
+_SKIP = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form',
+         'figure', 'figcaption', 'button', 'select', 'iframe', 'svg', 'template'}
+_CONTAINERS = {'body', 'main', 'article', 'section', 'div', 'td'}
+_MIN_PARAGRAPH = 25
+
+
+class _ReadabilityParser(HTMLParser):
+    """Collects paragraphs with the chain of containers they sit in"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._containers: List[Tuple[str, int]] = []
+        self._next_id = 0
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._parts: Optional[List[str]] = None
+        self._link_chars = 0
+        self.paragraphs: List[Tuple[Tuple[int, ...], str]] = []
+        self.scores: Dict[int, float] = defaultdict(float)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP:
+            self._skip_depth += 1
+        elif self._skip_depth:
+            return
+        elif tag in _CONTAINERS:
+            self._end_paragraph()
+            self._next_id += 1
+            self._containers.append((tag, self._next_id))
+        elif tag == 'p':
+            self._end_paragraph()
+            self._parts, self._link_chars = [], 0
+        elif tag == 'a':
+            self._link_depth += 1
+        elif tag == 'br' and self._parts is not None:
+            self._parts.append(' ')
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif self._skip_depth:
+            return
+        elif tag == 'p':
+            self._end_paragraph()
+        elif tag == 'a':
+            self._link_depth = max(0, self._link_depth - 1)
+        elif tag in _CONTAINERS:
+            self._end_paragraph()
+            # Tolerate unclosed tags: pop back to the matching container
+            for i in range(len(self._containers) - 1, -1, -1):
+                if self._containers[i][0] == tag:
+                    del self._containers[i:]
+                    break
+
+    def handle_data(self, data):
+        if self._parts is not None and not self._skip_depth:
+            self._parts.append(data)
+            if self._link_depth:
+                self._link_chars += len(data)
+
+    def _end_paragraph(self):
+        if self._parts is None:
+            return
+        text = ' '.join(''.join(self._parts).split())
+        self._parts = None
+        # Navigation lists and "related articles" blocks are mostly links
+        if len(text) < _MIN_PARAGRAPH or self._link_chars > len(text) / 2:
+            return
+        chain = tuple(container_id for _, container_id in self._containers)
+        self.paragraphs.append((chain, text))
+        if chain:
+            self.scores[chain[-1]] += len(text)
+            if len(chain) > 1:
+                self.scores[chain[-2]] += len(text) / 2
+
+    def close(self):
+        super().close()
+        self._end_paragraph()
+
+
+def extract_text(html: str) -> str:
+    """Main article text of an HTML page, paragraphs separated by newlines"""
+    parser = _ReadabilityParser()
+    parser.feed(html)
+    parser.close()
+    if parser.scores:
+        best = max(parser.scores, key=parser.scores.get)
+        paragraphs = [text for chain, text in parser.paragraphs if best in chain]
+    else:
+        paragraphs = [text for _, text in parser.paragraphs]
+    return unicodedata.normalize('NFC', '\n'.join(paragraphs))
+
+
+class BodyCache:
+    """Extracted bodies by URL; an empty body records a failed attempt"""
+
+    def __init__(self, path: Optional[str] = EXTRACT_CACHE_PATH):
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._db = None
+        if path:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+                self._db.execute('PRAGMA journal_mode=WAL')
+                self._db.execute('CREATE TABLE IF NOT EXISTS bodies '
+                                 '(url TEXT PRIMARY KEY, body TEXT NOT NULL, fetched_at REAL NOT NULL)')
+                self._db.commit()
+            except Exception as e:
+                print(f"Body cache disk tier disabled: {e}")
+                self._db = None
+
+    def get(self, url: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            hit = self._memory.get(url)
+            if hit is None and self._db is not None:
+                hit = self._db.execute('SELECT body, fetched_at FROM bodies WHERE url = ?',
+                                       (url,)).fetchone()
+            return tuple(hit) if hit else None
+
+    def set(self, url: str, body: str):
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                self._db.execute('INSERT OR REPLACE INTO bodies (url, body, fetched_at) VALUES (?, ?, ?)',
+                                 (url, body, now))
+                self._db.commit()
+            else:
+                self._memory[url] = (body, now)
+                while len(self._memory) > MEMORY_ENTRIES:
+                    self._memory.popitem(last=False)
+
+
+class BodyExtractor:
+    """Downloads and extracts article pages, at most ``per_host`` at a time per site"""
+
+    def __init__(self, cache: Optional[BodyCache] = None, per_host: int = EXTRACT_PER_HOST,
+                 timeout: float = EXTRACT_TIMEOUT):
+        self.cache = cache if cache is not None else BodyCache()
+        self.timeout = timeout
+        self.session = requests.Session()
+        # pool_block makes threads wait for one of the host's connections
+        adapter = HTTPAdapter(pool_connections=64, pool_maxsize=per_host, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = USER_AGENT
+        self.counters = {'cache_hits': 0, 'extracted': 0, 'failed': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def body(self, url: str) -> str:
+        """Extracted text of ``url``, '' if the page could not be used"""
+        cached = self.cache.get(url)
+        if cached is not None:
+            body, fetched_at = cached
+            if body or time.time() - fetched_at < EXTRACT_RETRY_SECONDS:
+                self._count('cache_hits')
+                return body
+        try:
+            body = extract_text(self._download(url))
+            self._count('extracted')
+        except Exception as e:
+            print(f"Error extracting {url}: {e}")
+            body = ''
+            self._count('failed')
+        self.cache.set(url, body)
+        return body
+
+    def _download(self, url: str) -> str:
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            chunks, size = [], 0
+            for chunk in response.iter_content(64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= MAX_PAGE_BYTES:
+                    break
+            content_type = response.headers.get('Content-Type', '')
+            # Without a declared charset requests assumes Latin-1; these sites are UTF-8
+            encoding = response.encoding if 'charset' in content_type.lower() else 'utf-8'
+            return b''.join(chunks).decode(encoding or 'utf-8', errors='replace')
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters)
@@ -0,0 +1,118 @@
+"""
+Per-feed HTTP cache: validators (ETag, Last-Modified, content hash) and the
+last response body, persisted to disk across refreshes and restarts
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+FEED_CACHE_DIR = os.getenv('FEED_CACHE_DIR', os.path.join('.cache', 'feeds'))
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class FeedCache:
+    """Validator store for conditional GETs, safe to share between fetch threads"""
+
+    def __init__(self, directory: str = FEED_CACHE_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.json')
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Ignoring unreadable feed cache {self.index_path}: {e}")
+            return {}
+
+    def _body_path(self, url: str) -> str:
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{name}.xml')
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def body(self, url: str) -> Optional[bytes]:
+        """Last stored response body for ``url``, if any"""
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for the next request"""
+        entry = self.get(url)
+        # A 304 is only useful if we still have the body it refers to
+        if not entry or not os.path.exists(self._body_path(url)):
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url: str, content: bytes) -> bool:
+        """True if ``content`` is byte-identical to the stored body"""
+        entry = self.get(url)
+        return bool(entry) and entry.get('content_hash') == content_hash(content)
+
+    def touch(self, url: str):
+        """Record that the feed was checked and found unchanged"""
+        with self._lock:
+            if url in self._entries:
+                self._entries[url]['checked_at'] = time.time()
+                self._dirty = True
+
+    def store(self, url: str, content: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None):
+        """Remember a fresh 200 response"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._body_path(url)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock:
+            self._entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_hash': content_hash(content),
+                'size': len(content),
+                'fetched_at': now,
+                'checked_at': now,
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write the validator index to disk atomically"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._entries, ensure_ascii=False, indent=1)
+            self._dirty = False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f'{self.index_path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save feed cache: {e}")
@@ -0,0 +1,183 @@
+"""
+Per-feed health and circuit breakers.
+
+A feed failing FEED_BREAKER_THRESHOLD fetches in a row (timeouts, HTTP
+errors, unparseable payloads) trips its breaker open: refreshes skip it
+without touching the network for FEED_BREAKER_COOLDOWN seconds. Then one
+refresh probes it (half-open). Success closes the breaker; failure opens
+it again for twice as long, up to FEED_BREAKER_MAX_COOLDOWN.
+
+While a feed is failing, the articles it last delivered stay published
+and are reported stale, along with the sources it carries.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Set
+
+from fetcher import FeedResult
+
+BREAKER_THRESHOLD = int(os.getenv('FEED_BREAKER_THRESHOLD', '3'))
+BREAKER_COOLDOWN = float(os.getenv('FEED_BREAKER_COOLDOWN', '300'))
+BREAKER_MAX_COOLDOWN = float(os.getenv('FEED_BREAKER_MAX_COOLDOWN', '3600'))
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class FeedHealth:
+    """Breaker state of one feed; times are epoch seconds so they can be shared"""
+
+    def __init__(self, url: str, cooldown: float = BREAKER_COOLDOWN):
+        self.url = url
+        self.state = CLOSED
+        # Consecutive failed fetches
+        self.failures = 0
+        self.cooldown = cooldown
+        # When an open breaker lets the next probe through
+        self.retry_at = 0.0
+        self.last_success: Optional[float] = None
+        self.last_error: Optional[str] = None
+        # Source names of the articles this feed delivered
+        self.sources: Set[str] = set()
+
+    @property
+    def stale(self) -> bool:
+        """True while the feed's latest fetch failed"""
+        return self.failures > 0
+
+    def to_dict(self) -> Dict:
+        return {'state': self.state, 'failures': self.failures, 'cooldown': self.cooldown,
+                'retry_at': self.retry_at, 'last_success': self.last_success,
+                'last_error': self.last_error, 'sources': sorted(self.sources)}
+
+    @classmethod
+    def from_dict(cls, url: str, data: Dict) -> 'FeedHealth':
+        health = cls(url, data.get('cooldown', BREAKER_COOLDOWN))
+        health.state = data.get('state', CLOSED)
+        health.failures = data.get('failures', 0)
+        health.retry_at = data.get('retry_at', 0.0)
+        health.last_success = data.get('last_success')
+        health.last_error = data.get('last_error')
+        health.sources = set(data.get('sources', ()))
+        return health
+
+
+class FeedHealthTracker:
+    """Breakers for every feed, safe to share between fetch threads"""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN,
+                 max_cooldown: float = BREAKER_MAX_COOLDOWN):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self._feeds: Dict[str, FeedHealth] = {}
+        self._lock = threading.Lock()
+        # Bumped whenever the set of stale feeds or their details change
+        self.version = 0
+        self.counters = {'skipped': 0, 'opened': 0, 'recovered': 0}
+
+    def _get(self, url: str) -> FeedHealth:
+        health = self._feeds.get(url)
+        if health is None:
+            health = self._feeds[url] = FeedHealth(url, self.cooldown)
+        return health
+
+    def get(self, url: str) -> Optional[FeedHealth]:
+        return self._feeds.get(url)
+
+    def allow(self, url: str, now: Optional[float] = None) -> bool:
+        """Whether to fetch ``url`` now; an expired open breaker lets one probe through"""
+        now = time.time() if now is None else now
+        with self._lock:
+            health = self._feeds.get(url)
+            if health is None or health.state == CLOSED:
+                return True
+            if now < health.retry_at:
+                self.counters['skipped'] += 1
+                return False
+            # Half-open: this fetch is the probe. Should its result never be
+            # recorded, another probe is allowed after a further cooldown
+            health.state = HALF_OPEN
+            health.retry_at = now + health.cooldown
+            return True
+
+    def record(self, result: FeedResult, now: Optional[float] = None):
+        """Update the feed's breaker with a fetch outcome; skipped fetches do not count"""
+        if result.skipped:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            health = self._get(result.url)
+            if result.ok:
+                if health.stale:
+                    print(f"Feed {result.url} recovered after {health.failures} failed fetch(es)")
+                    self.counters['recovered'] += 1
+                    self.version += 1
+                health.state = CLOSED
+                health.failures = 0
+                health.cooldown = self.cooldown
+                health.last_success = now
+                health.last_error = None
+                return
+            health.failures += 1
+            health.last_error = result.error
+            if health.state == HALF_OPEN:
+                health.cooldown = min(self.max_cooldown, health.cooldown * 2)
+            if health.state == HALF_OPEN or (health.state == CLOSED and health.failures >= self.threshold):
+                health.state = OPEN
+                health.retry_at = now + health.cooldown
+                self.counters['opened'] += 1
+                print(f"Circuit breaker open for {result.url} after {health.failures} failures; "
+                      f"retrying in {health.cooldown:.0f}s")
+            self.version += 1
+
+    def add_source(self, url: str, source: str):
+        """Remember that ``url`` delivers articles from ``source``"""
+        with self._lock:
+            health = self._get(url)
+            if source not in health.sources:
+                health.sources.add(source)
+                if health.stale:
+                    self.version += 1
+
+    def stale(self) -> Dict[str, Dict]:
+        """Feed URL -> health details of every feed whose latest fetch failed"""
+        with self._lock:
+            return {url: health.to_dict() for url, health in self._feeds.items() if health.stale}
+
+    def stale_feeds(self, source_name: Optional[Callable[[str], str]] = None) -> Dict[str, Dict]:
+        """
+        Feed URL -> staleness details of every failing feed, for API clients.
+        ``source_name`` names the source of a feed that has not delivered an
+        article yet (e.g. right after a restart) from its URL.
+        """
+        feeds = {}
+        for url, health in self.stale().items():
+            last_success = health['last_success']
+            feeds[url] = {
+                'sources': health['sources'] or ([source_name(url)] if source_name else []),
+                'state': health['state'], 'failures': health['failures'],
+                'last_success': datetime.fromtimestamp(last_success).isoformat() if last_success else None,
+                'error': health['last_error'],
+            }
+        return feeds
+
+    def export(self) -> Dict[str, Dict]:
+        """JSON-ready state of every known feed, for other processes"""
+        with self._lock:
+            return {url: health.to_dict() for url, health in self._feeds.items()}
+
+    def load(self, data: Dict[str, Dict]):
+        """Adopt the state exported by the process that fetches feeds"""
+        with self._lock:
+            self._feeds = {url: FeedHealth.from_dict(url, item) for url, item in data.items()}
+            self.version += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            states = [health.state for health in self._feeds.values()]
+            return dict(self.counters, feeds=len(states), open=states.count(OPEN),
+                        half_open=states.count(HALF_OPEN),
+                        stale=sum(health.stale for health in self._feeds.values()))
@@ -0,0 +1,86 @@
+"""
+Feed registry loaded from feeds.json (or FEEDS_CONFIG)
+
+    {
+      "sources": {"cafef.vn": "Cafef", ...},
+      "feeds": [
+        {"url": "https://cafef.vn/home.rss", "priority": 10,
+         "max_entries": 20, "poll_interval": 300, "weight": 1.1, "enabled": true}
+      ]
+    }
+
+Only "url" is required per feed. "sources" maps a domain to the name
+shown for its articles; subdomains (www., m., ...) match their parent.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+FEEDS_CONFIG = os.getenv('FEEDS_CONFIG',
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feeds.json'))
+DEFAULT_MAX_ENTRIES = 20
+
+
+@dataclass(frozen=True)
+class FeedConfig:
+    """Settings for one feed"""
+    url: str
+    # Entries taken from each fetch, newest first as the feed lists them
+    max_entries: int = DEFAULT_MAX_ENTRIES
+    # Fixed seconds between polls for the refresher; None adapts to the feed
+    poll_interval: Optional[float] = None
+    # Higher priorities are fetched first
+    priority: int = 0
+    # Relevance multiplier for the feed's articles, e.g. above 1 for specialist finance outlets
+    weight: float = 1.0
+    enabled: bool = True
+
+
+class FeedRegistry:
+    """Enabled feeds by priority, per-feed settings and a domain -> source index"""
+
+    def __init__(self, feeds: List[FeedConfig], sources: Dict[str, str]):
+        self.all = feeds
+        self.feeds = sorted((f for f in feeds if f.enabled), key=lambda f: -f.priority)
+        self._by_url = {f.url: f for f in feeds}
+        self._sources = {domain.lower(): name for domain, name in sources.items()}
+
+    @classmethod
+    def load(cls, path: str = FEEDS_CONFIG) -> 'FeedRegistry':
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        feeds = []
+        for item in config.get('feeds', ()):
+            if isinstance(item, str):
+                item = {'url': item}
+            feeds.append(FeedConfig(**item))
+        return cls(feeds, config.get('sources', {}))
+
+    def __len__(self) -> int:
+        return len(self.feeds)
+
+    def urls(self) -> List[str]:
+        """Enabled feed URLs, highest priority first"""
+        return [f.url for f in self.feeds]
+
+    def get(self, url: str) -> FeedConfig:
+        """Settings for ``url``; defaults for feeds not in the registry"""
+        return self._by_url.get(url) or FeedConfig(url=url)
+
+    def source_name(self, url: str) -> str:
+        """
+        Display name for the site serving ``url``, else its domain.
+
+        Tries the host and then each parent domain, so a lookup costs
+        O(labels in the host) however many sources are registered.
+        """
+        domain = (urlsplit(url).hostname or '').rstrip('.')
+        labels = domain.split('.')
+        for i in range(len(labels) - 1):
+            name = self._sources.get('.'.join(labels[i:]))
+            if name is not None:
+                return name
+        return urlsplit(url).netloc
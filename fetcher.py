@@ -0,0 +1,150 @@
+"""
+RSS feed fetching for the news aggregator; the refresh pipeline runs one
+fetch per feed concurrently, all bounded by the refresh deadline
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+
+from feed_cache import FeedCache
+
+# Per-feed timeouts (seconds) and the deadline for a whole refresh cycle
+CONNECT_TIMEOUT = float(os.getenv('FEED_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('FEED_READ_TIMEOUT', '15'))
+FETCH_DEADLINE = float(os.getenv('FEED_FETCH_DEADLINE', '25'))
+# Most feed downloads in flight at once; a refresh uses one thread per feed up to this
+MAX_WORKERS = int(os.getenv('FEED_FETCH_WORKERS', '64'))
+
+USER_AGENT = "Mozilla/5.0 (compatible; VietnameseFinanceNewsAggregator/1.0)"
+_CHUNK_SIZE = 16 * 1024
+
+
+@dataclass
+class FeedResult:
+    """Outcome of fetching a single feed"""
+    url: str
+    feed: Optional[Any] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    size: int = 0
+    not_modified: bool = False
+    # Not requested at all: the feed's circuit breaker is open, or the
+    # refresh deadline passed before its turn
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and (self.feed is not None or self.not_modified)
+
+
+def _make_session(pool_size: int) -> requests.Session:
+    """Create a keep-alive session sized for the fetch pool"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+_session = _make_session(MAX_WORKERS)
+
+
+def _parse(content: bytes, headers=None):
+    return feedparser.parse(content, response_headers=headers or {})
+
+
+def _read_body(response: requests.Response, deadline: Optional[float]) -> bytes:
+    """
+    The streamed body of ``response``. Gives up at ``deadline``: the read
+    timeout bounds each socket read, not a body that keeps trickling in.
+    """
+    if deadline is None:
+        return response.content
+    # read1 (urllib3 2) returns whatever has arrived instead of waiting
+    # for a whole chunk, so a trickle cannot stall between checks
+    read1 = getattr(response.raw, 'read1', None)
+    reads = iter(lambda: read1(_CHUNK_SIZE, decode_content=True), b'') if read1 \
+        else response.iter_content(_CHUNK_SIZE)
+    chunks = []
+    for chunk in reads:
+        chunks.append(chunk)
+        if time.monotonic() > deadline:
+            response.close()
+            raise TimeoutError('refresh deadline exceeded while downloading')
+    return b''.join(chunks)
+
+
+def fetch_feed(url: str, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+               session: Optional[requests.Session] = None,
+               cache: Optional[FeedCache] = None,
+               skip_unchanged: bool = False,
+               deadline: Optional[float] = None) -> FeedResult:
+    """
+    Download and parse one feed, never raising.
+
+    ``deadline`` (a time.monotonic() value) bounds the whole download: the
+    timeouts are capped at the time left and the body is abandoned once
+    it passes.
+
+    With a ``cache`` the request is conditional. An unchanged feed (304, or
+    a 200 with an identical body) is flagged ``not_modified``; it is only
+    parsed from the cached body when ``skip_unchanged`` is False, i.e. when
+    the caller does not still hold the previous parse.
+    """
+    started = time.monotonic()
+    result = FeedResult(url=url)
+    try:
+        headers = cache.conditional_headers(url) if cache else {}
+        if deadline is not None:
+            left = deadline - started
+            if left <= 0:
+                raise TimeoutError('refresh deadline exceeded')
+            timeout = tuple(min(t, left) for t in timeout)
+        response = (session or _session).get(url, timeout=timeout, headers=headers,
+                                             stream=deadline is not None)
+        result.status = response.status_code
+        # Read even error and 304 bodies, so the connection goes back to the pool
+        content = _read_body(response, deadline)
+        response_headers = {k.lower(): v for k, v in response.headers.items()}
+
+        if response.status_code == 304:
+            result.not_modified = True
+            cache.touch(url)
+            if not skip_unchanged:
+                result.feed = _parse(cache.body(url) or b'')
+        else:
+            response.raise_for_status()
+            result.size = len(content)
+            if cache and cache.is_unchanged(url, content):
+                result.not_modified = True
+                cache.touch(url)
+                if not skip_unchanged:
+                    result.feed = _parse(content, response_headers)
+            else:
+                feed = _parse(content, response_headers)
+                if feed.bozo and not feed.entries:
+                    # An error page or truncated body: fail, keeping the last good copy cached
+                    raise ValueError(f"unparseable feed: {feed.get('bozo_exception')}")
+                if cache:
+                    cache.store(url, content, response.headers.get('ETag'),
+                                response.headers.get('Last-Modified'))
+                result.feed = feed
+    except Exception as e:
+        result.error = str(e) or e.__class__.__name__
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+def cached_feed(url: str, cache: FeedCache):
+    """The last good payload stored for ``url``, parsed, or None if there is none"""
+    body = cache.body(url)
+    return _parse(body) if body else None
+
@@ -0,0 +1,121 @@
+"""
+Keyword classification for finance and policy news.
+
+All terms are compiled once, at import time, into a single trie-shaped
+alternation regex. One scan over the text returns every matched term with its
+category and position.
+"""
+
+import re
+import unicodedata
+from typing import Iterator, List, NamedTuple
+
+FINANCIAL = 'financial'
+POLICY = 'policy'
+
+# (term, category); each term appears exactly once
+KEYWORDS = [
+    ('tài chính', FINANCIAL), ('kinh tế', FINANCIAL), ('ngân hàng', FINANCIAL),
+    ('chứng khoán', FINANCIAL), ('đầu tư', FINANCIAL), ('GDP', FINANCIAL),
+    ('lạm phát', FINANCIAL), ('lãi suất', FINANCIAL), ('tỷ giá', FINANCIAL),
+    ('thị trường', FINANCIAL), ('thuế', FINANCIAL), ('ngân sách', FINANCIAL),
+    ('nợ công', FINANCIAL), ('xuất khẩu', FINANCIAL), ('nhập khẩu', FINANCIAL),
+    ('doanh nghiệp', FINANCIAL), ('cổ phiếu', FINANCIAL), ('trái phiếu', FINANCIAL),
+    ('bất động sản', FINANCIAL), ('tiền tệ', FINANCIAL), ('vốn', FINANCIAL),
+    ('tín dụng', FINANCIAL), ('tăng trưởng', FINANCIAL), ('công ty', FINANCIAL),
+    ('chính sách', POLICY), ('luật', POLICY), ('nghị định', POLICY),
+    ('thông tư', POLICY), ('quyết định', POLICY), ('chính phủ', POLICY),
+    ('bộ', POLICY), ('ngành', POLICY), ('cơ quan', POLICY),
+    ('quy định', POLICY), ('hướng dẫn', POLICY),
+]
+
+# Terms that make an article relevant enough to keep
+FILTER_TERMS = frozenset([
+    'tài chính', 'kinh tế', 'ngân hàng', 'chứng khoán', 'đầu tư',
+    'GDP', 'lạm phát', 'lãi suất', 'tỷ giá', 'thị trường',
+    'chính sách', 'thuế', 'ngân sách', 'nợ công', 'xuất khẩu',
+    'nhập khẩu', 'doanh nghiệp', 'cổ phiếu', 'trái phiếu',
+    'bất động sản', 'tiền tệ', 'vốn', 'tín dụng',
+])
+
+
+class KeywordMatch(NamedTuple):
+    term: str       # canonical spelling from KEYWORDS
+    category: str
+    start: int      # offsets into normalize(text)
+    end: int
+
+
+def normalize(text: str) -> str:
+    """NFC-compose and lowercase, so NFD feeds and capitalised titles match"""
+    return unicodedata.normalize('NFC', text).lower()
+
+
+_CANONICAL = {normalize(term): (term, category) for term, category in KEYWORDS}
+
+def _trie_pattern(terms) -> str:
+    """
+    Regex alternation factored into a prefix trie.
+
+    Python's re tries alternatives one by one at every position; sharing
+    prefixes ("ngân hàng" / "ngân sách") lets it reject most positions
+    after a single character test.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node) -> str:
+        if list(node) == ['']:
+            return ''
+        branches = []
+        optional = '' in node
+        for char in sorted(c for c in node if c):
+            branches.append(re.escape(char) + build(node[char]))
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Trying the longer continuation first keeps matches leftmost-longest
+        return f'(?:{body})?' if optional else body
+
+    return build(trie)
+
+
+# Trailing \b stops short syllables like "bộ" matching inside "bộc"; the
+# leading boundary is checked in Python, which is cheaper than a regex
+# assertion evaluated at every position
+_PATTERN = re.compile(_trie_pattern(_CANONICAL) + r'\b')
+_FILTER_PATTERN = re.compile(_trie_pattern([normalize(t) for t in FILTER_TERMS]) + r'\b')
+
+
+def _starts_word(text: str, start: int) -> bool:
+    return start == 0 or not text[start - 1].isalnum()
+
+
+def iter_matches(text: str) -> Iterator[KeywordMatch]:
+    """Yield non-overlapping keyword matches, left to right"""
+    if not text:
+        return
+    text = normalize(text)
+    for match in _PATTERN.finditer(text):
+        start = match.start()
+        if _starts_word(text, start):
+            term, category = _CANONICAL[match.group()]
+            yield KeywordMatch(term, category, start, match.end())
+
+
+def find_keywords(text: str) -> List[KeywordMatch]:
+    """Every keyword match in ``text`` with its category and position"""
+    return list(iter_matches(text))
+
+
+def has_filter_term(text: str) -> bool:
+    """True as soon as one relevance keyword is found"""
+    if not text:
+        return False
+    text = normalize(text)
+    for match in _FILTER_PATTERN.finditer(text):
+        if _starts_word(text, match.start()):
+            return True
+    return False
@@ -0,0 +1,187 @@
+"""
+In-process metrics rendered in the Prometheus text format, and
+structured (JSON lines) event logs.
+
+Counters and histograms are labelled series kept in memory and updated
+where the work happens; collectors read the counters components already
+keep (response caches, LLM worker, archive) at scrape time. With
+LOG_FORMAT=json, log_event() writes one JSON object per line for feed
+fetches, refreshes, LLM calls and requests.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+REFRESH_BUCKETS = (1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: str = '') -> str:
+    parts = ['%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+             for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{%s}' % ','.join(parts) if parts else ''
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._series: Dict[Labels, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {tuple(labels)}")
+        return tuple((name, str(labels[name])) for name in self.labels)
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+    def lines(self) -> Iterable[str]:
+        with self._lock:
+            series = list(self._series.items())
+        for labels, value in series:
+            yield f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket counts, then the total count and sum
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0, 0.0]
+            position = bisect.bisect_left(self.buckets, value)
+            if position < len(self.buckets):
+                series[position] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def lines(self) -> Iterable[str]:
+        with self._lock:
+            series = [(labels, list(values)) for labels, values in self._series.items()]
+        for labels, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                le = 'le="%s"' % _format_value(bound)
+                yield f"{self.name}_bucket{_format_labels(labels, le)} {cumulative}"
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_format_labels(labels, le)} {values[-2]}"
+            yield f"{self.name}_count{_format_labels(labels)} {values[-2]}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(values[-1])}"
+
+
+class Collected(_Metric):
+    """Series read from elsewhere at scrape time: ``collect`` yields (labels dict, value)"""
+
+    def __init__(self, name: str, help: str, kind: str,
+                 collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]):
+        super().__init__(name, help)
+        self.kind = kind
+        self.collect = collect
+
+    def lines(self) -> Iterable[str]:
+        for labels, value in self.collect():
+            yield f"{self.name}{_format_labels(tuple(labels.items()))} {_format_value(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def collect(self, name: str, help: str, kind: str,
+                collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]]) -> Collected:
+        return self._add(Collected(name, help, kind, collect))
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics)
+        out = []
+        for metric in metrics:
+            try:
+                lines = list(metric.lines())
+            except Exception as e:
+                print(f"Error collecting metric {metric.name}: {e}")
+                continue
+            out.append(f"# HELP {metric.name} {metric.help}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(lines)
+        return '\n'.join(out) + '\n'
+
+
+REGISTRY = Registry()
+
+FEED_FETCH_SECONDS = REGISTRY.histogram(
+    'news_feed_fetch_seconds', 'Feed download and parse time by outcome (ok, not_modified, error)',
+    ('feed', 'outcome'))
+FEED_FETCH_BYTES = REGISTRY.histogram(
+    'news_feed_fetch_bytes', 'Size of downloaded feed payloads', ('feed',), SIZE_BUCKETS)
+STAGE_SECONDS = REGISTRY.histogram(
+    'news_pipeline_stage_seconds', 'Time one item spends in each refresh pipeline stage', ('stage',))
+REFRESH_SECONDS = REGISTRY.histogram(
+    'news_refresh_seconds', 'Wall time of whole refreshes', (), REFRESH_BUCKETS)
+REFRESH_ARTICLES = REGISTRY.counter(
+    'news_refresh_articles_total', 'Articles published or updated by refreshes')
+LLM_CALLS = REGISTRY.counter(
+    'news_llm_calls_total', 'LLM summary calls by outcome (ok, error)', ('backend', 'outcome'))
+LLM_SECONDS = REGISTRY.histogram(
+    'news_llm_call_seconds', 'Latency of LLM summary calls', ('backend',))
+LLM_TOKENS = REGISTRY.counter(
+    'news_llm_tokens_total', 'Estimated tokens sent to the LLM', ('backend',))
+REQUEST_SECONDS = REGISTRY.histogram(
+    'news_http_request_seconds', 'Time to produce a response, by route', ('route', 'method', 'status'))
+
+
+def log_event(event: str, **fields):
+    """One JSON line describing ``event`` when LOG_FORMAT=json; nothing otherwise"""
+    if LOG_FORMAT != 'json':
+        return
+    record = {'ts': round(time.time(), 3), 'event': event, **fields}
+    print(json.dumps(record, ensure_ascii=False, default=str), flush=True)
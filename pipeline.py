@@ -0,0 +1,162 @@
+"""
+Streaming pipeline of threaded stages joined by bounded queues
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from metrics import STAGE_SECONDS
+
+# Items buffered between two stages; a full queue pauses the stage feeding it
+QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '64'))
+
+_DONE = object()
+
+
+class Stage:
+    """
+    One step of a pipeline run by ``workers`` threads.
+
+    ``fn`` maps an item to its output; returning None drops the item.
+    With ``expand`` the output is an iterable whose items are passed on
+    one by one (e.g. a feed into its entries). With ``batch`` > 1, ``fn``
+    maps a list of items to a list of outputs instead: each call gets the
+    items already waiting, up to ``batch``, without waiting for more.
+    """
+
+    def __init__(self, name: str, fn: Callable, workers: int = 1, expand: bool = False,
+                 batch: int = 1):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.expand = expand
+        self.batch = max(1, batch)
+        self.counters = {'in': 0, 'out': 0, 'errors': 0, 'busy_seconds': 0.0}
+        self._lock = threading.Lock()
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                self.counters[name] += delta
+
+
+class Pipeline:
+    """
+    Runs items through stages concurrently; results stream out as soon
+    as each item clears the last stage, in completion order.
+
+    Every queue is bounded, so at most about ``queue_size`` items per
+    stage are in memory however large the input is. A failing item is
+    logged and dropped without stopping the run.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = QUEUE_SIZE):
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def run(self, source: Iterable) -> Iterator:
+        stop = threading.Event()
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._feed, args=(source, queues[0], stop),
+                                    daemon=True, name='pipeline-source')]
+        for stage, inbox, outbox in zip(self.stages, queues, queues[1:]):
+            remaining = [stage.workers]
+            for i in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work, args=(stage, inbox, outbox, stop, remaining),
+                    daemon=True, name=f'pipeline-{stage.name}-{i}'))
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            # Also reached when the consumer stops early: release blocked workers
+            stop.set()
+
+    @staticmethod
+    def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _feed(self, source: Iterable, outbox: queue.Queue, stop: threading.Event):
+        try:
+            for item in source:
+                if not self._put(outbox, item, stop):
+                    return
+        except Exception as e:
+            print(f"Error reading pipeline source: {e}")
+        self._put(outbox, _DONE, stop)
+
+    def _work(self, stage: Stage, inbox: queue.Queue, outbox: queue.Queue,
+              stop: threading.Event, remaining: List[int]):
+        while not stop.is_set():
+            try:
+                items = [inbox.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            while len(items) < stage.batch and items[-1] is not _DONE:
+                try:
+                    items.append(inbox.get_nowait())
+                except queue.Empty:
+                    break
+            done = items[-1] is _DONE
+            if done:
+                items.pop()
+            if items and not self._process(stage, items, outbox, stop):
+                return
+            if done:
+                # Let sibling workers see the end too; the last one passes it on
+                inbox.put(_DONE)
+                with stage._lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    self._put(outbox, _DONE, stop)
+                return
+
+    def _process(self, stage: Stage, items: List, outbox: queue.Queue,
+                 stop: threading.Event) -> bool:
+        """Run ``items`` through ``stage``; False once the pipeline is stopping"""
+        started = time.perf_counter()
+        try:
+            results = stage.fn(items) if stage.batch > 1 else [stage.fn(items[0])]
+            outputs = []
+            for result in results:
+                if result is None:
+                    continue
+                if stage.expand:
+                    outputs.extend(result)
+                else:
+                    outputs.append(result)
+        except Exception as e:
+            print(f"Error in pipeline stage {stage.name}: {e}")
+            elapsed = time.perf_counter() - started
+            stage._count(**{'in': len(items), 'errors': len(items), 'busy_seconds': elapsed})
+            for _ in items:
+                STAGE_SECONDS.observe(elapsed / len(items), stage=stage.name)
+            return True
+        elapsed = time.perf_counter() - started
+        stage._count(**{'in': len(items), 'out': len(outputs), 'busy_seconds': elapsed})
+        for _ in items:
+            STAGE_SECONDS.observe(elapsed / len(items), stage=stage.name)
+        for output in outputs:
+            if not self._put(outbox, output, stop):
+                return False
+        return True
+
+    def stats(self) -> Dict[str, Dict]:
+        return {stage.name: dict(stage.counters, workers=stage.workers)
+                for stage in self.stages}
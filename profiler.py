@@ -0,0 +1,161 @@
+"""
+Opt-in sampling profiler for one refresh (PROFILER_ENABLED=1).
+
+Once armed, the next refresh samples the stacks of the threads doing
+its work every PROFILE_INTERVAL seconds. Samples are attributed to the
+pipeline stage of the thread that took them ("store" for the refreshing
+thread itself, "llm" for summary workers) and, inside feed downloads,
+to the feed being fetched. Idle samples (workers waiting on a queue)
+are left out. The stacks are kept in collapsed form, one
+"frame;frame;frame count" line per distinct stack, which flamegraph.pl
+and speedscope read directly, and written to PROFILE_PATH; the rest of
+the report goes to PROFILE_PATH.json, where other processes (the web
+workers, when the refresher does the refreshing) read it.
+"""
+
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', '0').lower() in ('1', 'true', 'yes')
+PROFILE_INTERVAL = float(os.getenv('PROFILE_INTERVAL', '0.005'))
+PROFILE_PATH = os.getenv('PROFILE_PATH', os.path.join('.cache', 'refresh-profile.txt'))
+
+# Innermost frames of a thread blocked waiting for work rather than doing it
+_IDLE_FILES = ('threading.py', 'queue.py')
+_MAX_DEPTH = 64
+
+
+def _thread_label(thread: threading.Thread, owner: int) -> Optional[str]:
+    """Stage a thread works for, or None for threads outside the refresh"""
+    if thread.ident == owner:
+        return 'store'
+    name = thread.name
+    if name.startswith('pipeline-'):
+        # pipeline-<stage>-<worker>
+        return name[len('pipeline-'):].rsplit('-', 1)[0]
+    if name.startswith('llm-summary'):
+        return 'llm'
+    return None
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class SamplingProfiler:
+    """Samples thread stacks during a refresh() session once armed"""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL, path: Optional[str] = PROFILE_PATH):
+        self.interval = interval
+        self.path = path
+        self._armed = threading.Event()
+        self._lock = threading.Lock()
+        self.last_report: Optional[Dict] = None
+
+    def arm(self):
+        """Profile the next refresh"""
+        self._armed.set()
+
+    @property
+    def armed(self) -> bool:
+        return self._armed.is_set()
+
+    def install_signal(self, signum: int = getattr(signal, 'SIGUSR1', 0)):
+        """Arm on ``signum`` (SIGUSR1), e.g. `kill -USR1 <refresher pid>`"""
+        if signum:
+            signal.signal(signum, lambda *_: self.arm())
+
+    @contextmanager
+    def refresh(self, label: str = 'refresh'):
+        """Sample the enclosed refresh if armed; otherwise costs nothing"""
+        if not self._armed.is_set() or not self._lock.acquire(blocking=False):
+            yield
+            return
+        self._armed.clear()
+        stop = threading.Event()
+        stacks: Counter = Counter()
+        sampler = threading.Thread(target=self._sample, args=(threading.get_ident(), stacks, stop),
+                                   daemon=True, name='profiler')
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            sampler.join()
+            self._finish(label, stacks, time.perf_counter() - started)
+            self._lock.release()
+
+    def saved_report(self) -> Optional[Dict]:
+        """The last report written to ``path``, possibly by another process"""
+        if not self.path:
+            return None
+        try:
+            with open(f'{self.path}.json', encoding='utf-8') as f:
+                report = json.load(f)
+            with open(self.path, encoding='utf-8') as f:
+                report['collapsed'] = f.read()
+        except (OSError, ValueError):
+            return None
+        return report
+
+    def _sample(self, owner: int, stacks: Counter, stop: threading.Event):
+        while not stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread in threading.enumerate():
+                label = _thread_label(thread, owner)
+                frame = frames.get(thread.ident)
+                if label is None or frame is None:
+                    continue
+                if os.path.basename(frame.f_code.co_filename) in _IDLE_FILES:
+                    continue
+                names, feed = [], None
+                while frame is not None and len(names) < _MAX_DEPTH:
+                    names.append(_frame_name(frame))
+                    if frame.f_code.co_name == 'fetch_feed':
+                        feed = frame.f_locals.get('url')
+                    frame = frame.f_back
+                root = [label] + ([f"feed {feed}"] if feed else [])
+                stacks[';'.join(root + names[::-1])] += 1
+
+    def _finish(self, label: str, stacks: Counter, seconds: float):
+        by_stage: Counter = Counter()
+        by_feed: Counter = Counter()
+        for stack, count in stacks.items():
+            parts = stack.split(';', 2)
+            by_stage[parts[0]] += count
+            if len(parts) > 1 and parts[1].startswith('feed '):
+                by_feed[parts[1][len('feed '):]] += count
+        collapsed = ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        self.last_report = {
+            'label': label,
+            'finished_at': time.time(),
+            'seconds': round(seconds, 3),
+            'interval': self.interval,
+            'samples': sum(stacks.values()),
+            # Sample counts x interval ~ thread-seconds spent
+            'stages': dict(by_stage.most_common()),
+            'feeds': dict(by_feed.most_common()),
+            'collapsed': collapsed,
+        }
+        if self.path:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    f.write(collapsed)
+                with open(f'{self.path}.json', 'w', encoding='utf-8') as f:
+                    json.dump({k: v for k, v in self.last_report.items() if k != 'collapsed'}, f)
+            except OSError as e:
+                print(f"Could not write profile to {self.path}: {e}")
+        busiest = ', '.join(f"{stage} {count}" for stage, count in by_stage.most_common(5))
+        print(f"Profiled {label} ({seconds:.2f}s, {self.last_report['samples']} samples): {busiest}")
@@ -0,0 +1,126 @@
+"""
+Relevance scoring and ranking for aggregated articles.
+
+Each article gets a static keyword score when it is first processed
+(weighted keyword hits, title hits counting double; zero unless a
+finance term from FILTER_TERMS is among them). At every refresh
+the whole batch is re-scored in one vectorized pass: keyword score x
+feed weight (from feeds.json) x recency decay. The top K are kept so "top N by relevance"
+requests are served from a precomputed list.
+"""
+
+import heapq
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from article_record import Article
+from keywords import FILTER_TERMS, POLICY, iter_matches
+
+MIN_RELEVANCE = float(os.getenv('MIN_RELEVANCE', '1.0'))
+RELEVANCE_HALF_LIFE_HOURS = float(os.getenv('RELEVANCE_HALF_LIFE_HOURS', '12'))
+RELEVANCE_TOP_K = int(os.getenv('RELEVANCE_TOP_K', '200'))
+
+TITLE_WEIGHT = 2.0
+# Terms that decide relevance on their own weigh 1; other policy terms less
+FILTER_TERM_WEIGHT = 1.0
+POLICY_TERM_WEIGHT = 0.5
+# Syllables that are often not about government at all ("bộ phim", "ngành hàng")
+TERM_WEIGHTS = {'bộ': 0.25, 'ngành': 0.25}
+
+
+def _term_weight(term: str, category: str) -> float:
+    if term in TERM_WEIGHTS:
+        return TERM_WEIGHTS[term]
+    if term in FILTER_TERMS:
+        return FILTER_TERM_WEIGHT
+    return POLICY_TERM_WEIGHT if category == POLICY else FILTER_TERM_WEIGHT
+
+
+def keyword_score(title: str, content: str = "") -> float:
+    """
+    Static relevance from keyword hits; title hits count double. Policy
+    terms alone ("luật", "quyết định", "hướng dẫn") are too generic to
+    make an article relevant, so without a FILTER_TERMS hit it is 0.
+    """
+    title_matches = list(iter_matches(title))
+    content_matches = list(iter_matches(content))
+    if not any(m.term in FILTER_TERMS for m in title_matches + content_matches):
+        return 0.0
+    score = sum(_term_weight(m.term, m.category) for m in title_matches) * TITLE_WEIGHT
+    score += sum(_term_weight(m.term, m.category) for m in content_matches)
+    return score
+
+
+def score_batch(keyword_scores: np.ndarray, feed_weights: np.ndarray,
+                ages_hours: np.ndarray,
+                half_life_hours: float = RELEVANCE_HALF_LIFE_HOURS) -> np.ndarray:
+    """Vectorized relevance: keywords x feed weight x exponential recency decay"""
+    decay = np.exp2(-np.clip(ages_hours, 0, None) / half_life_hours)
+    return keyword_scores * feed_weights * decay
+
+
+class Ranker:
+    """
+    Keeps keyword scores per article and the current top-K ranking.
+    ``feed_weight`` maps the URL of the feed that delivered an article to
+    its weight; every feed weighs 1.0 without it.
+    """
+
+    def __init__(self, top_k: int = RELEVANCE_TOP_K,
+                 feed_weight: Optional[Callable[[str], float]] = None):
+        self.top_k = top_k
+        self.feed_weight = feed_weight or (lambda url: 1.0)
+        self._keyword_scores: Dict[str, float] = {}
+        self._ranked: List[Article] = []
+        self._lock = threading.Lock()
+
+    def add(self, article: Article, score: float):
+        with self._lock:
+            self._keyword_scores[article.url] = score
+
+    def keyword_score(self, url: str) -> float:
+        return self._keyword_scores.get(url, MIN_RELEVANCE)
+
+    def rank(self, articles: List[Article], now: Optional[datetime] = None) -> List[Article]:
+        """Score every article, store it as its relevance and keep the top K"""
+        now = now or datetime.now()
+        with self._lock:
+            # Forget scores for articles that have left the store
+            urls = {a.url for a in articles}
+            for url in [u for u in self._keyword_scores if u not in urls]:
+                del self._keyword_scores[url]
+
+            if not articles:
+                self._ranked = []
+                return self._ranked
+
+            keyword_scores = np.fromiter(
+                (self._keyword_scores.get(a.url, MIN_RELEVANCE) for a in articles),
+                dtype=np.float64, count=len(articles))
+            weights = {url: self.feed_weight(url) for url in {a.feed for a in articles}}
+            feed_weights = np.fromiter(
+                (weights[a.feed] for a in articles),
+                dtype=np.float64, count=len(articles))
+            now_ts = now.timestamp()
+            ages = np.fromiter(
+                ((now_ts - a.timestamp) / 3600.0 for a in articles),
+                dtype=np.float64, count=len(articles))
+
+            scores = score_batch(keyword_scores, feed_weights, ages).tolist()
+            for article, score in zip(articles, scores):
+                article.relevance = round(score, 4)
+
+            # Bounded heap: O(n log k) rather than sorting the whole batch
+            k = min(self.top_k, len(articles))
+            top = heapq.nlargest(k, range(len(articles)), key=scores.__getitem__)
+            self._ranked = [articles[i] for i in top]
+            return self._ranked
+
+    def top(self, limit: Optional[int] = None) -> List[Article]:
+        """Highest-scoring articles from the last rank() call"""
+        ranked = self._ranked
+        return ranked[:limit] if limit is not None else ranked
@@ -0,0 +1,115 @@
+"""
+Single-flight refresh jobs: concurrent refresh requests share one run
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+# A refresh requested sooner than this after the last one reuses its result
+MIN_REFRESH_INTERVAL = float(os.getenv('MIN_REFRESH_INTERVAL', '60'))
+# Finished jobs kept for status lookups
+MAX_JOBS = 50
+
+
+class RefreshJob:
+    """Status and progress of one refresh run"""
+
+    def __init__(self, feeds_total: int, trigger: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.trigger = trigger
+        self.state = 'running'
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.feeds_total = feeds_total
+        self.feeds_done = 0
+        self.articles: Optional[int] = None
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'state': self.state,
+            'trigger': self.trigger,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'feeds_total': self.feeds_total,
+            'feeds_done': self.feeds_done,
+            'articles': self.articles,
+            'error': self.error
+        }
+
+
+class RefreshCoordinator:
+    """
+    Runs ``refresh(on_result)`` on a background thread, at most once at a
+    time. A request while a job runs joins that job; a request within
+    ``min_interval`` of the last refresh (``last_refresh()``, which may
+    come from another process's snapshot) gets the last job back.
+    """
+
+    def __init__(self, refresh: Callable[[Callable], List[Dict]], feeds_total: Callable[[], int],
+                 last_refresh: Callable[[], Optional[datetime]],
+                 min_interval: float = MIN_REFRESH_INTERVAL):
+        self.refresh = refresh
+        self.feeds_total = feeds_total
+        self.last_refresh = last_refresh
+        self.min_interval = timedelta(seconds=min_interval)
+        self._jobs: "OrderedDict[str, RefreshJob]" = OrderedDict()
+        self._current: Optional[RefreshJob] = None
+        self._lock = threading.Lock()
+
+    def start(self, trigger: str = 'manual') -> Tuple[RefreshJob, bool]:
+        """The running or a new job, and whether this call started it"""
+        with self._lock:
+            if self._current is not None and self._current.state == 'running':
+                return self._current, False
+            last = self.last_refresh()
+            if last is not None and datetime.now() - last < self.min_interval:
+                if self._current is not None and self._current.state != 'failed':
+                    return self._current, False
+                # Refreshed elsewhere (e.g. by the refresher process): nothing to do
+                job = self._current = self._add(RefreshJob(self.feeds_total(), trigger))
+                job.state = 'skipped'
+                job.finished_at = job.started_at
+                job.done.set()
+                return job, False
+            job = self._current = self._add(RefreshJob(self.feeds_total(), trigger))
+        threading.Thread(target=self._run, args=(job,), daemon=True,
+                         name=f'refresh-{job.id}').start()
+        return job, True
+
+    def run(self, trigger: str = 'scheduled', timeout: Optional[float] = None) -> RefreshJob:
+        """Start or join a refresh and wait for it to finish"""
+        job, _ = self.start(trigger)
+        job.done.wait(timeout)
+        return job
+
+    def _add(self, job: RefreshJob) -> RefreshJob:
+        self._jobs[job.id] = job
+        while len(self._jobs) > MAX_JOBS:
+            self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Optional[RefreshJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: RefreshJob):
+        def on_result(result):
+            job.feeds_done += 1
+
+        try:
+            job.articles = len(self.refresh(on_result))
+            job.state = 'done'
+        except Exception as e:
+            print(f"Refresh job {job.id} failed: {e}")
+            job.error = str(e)
+            job.state = 'failed'
+        finally:
+            job.finished_at = datetime.now()
+            job.done.set()
@@ -0,0 +1,174 @@
+"""
+Standalone feed refresher: python -m refresher
+
+Polls each feed on its own schedule and publishes the articles through
+the shared snapshot file (SNAPSHOT_PATH), which the gunicorn workers
+load without ever fetching feeds on a request thread. It is the only
+process that writes the snapshot; /api/refresh and /cron/update in the
+workers ask it for a refresh of every feed through REFRESH_TRIGGER_PATH,
+and POST /debug/profile arms its profiler through PROFILE_TRIGGER_PATH.
+
+A feed's interval is its poll_interval in feeds.json if set, otherwise
+it follows how often the feed publishes: half the median gap between
+its recent entries, clamped to [REFRESH_MIN_INTERVAL,
+REFRESH_MAX_INTERVAL]. Failures back off exponentially, and every delay
+gets random jitter so feeds do not fall into lockstep. Feeds that keep
+failing are skipped by their circuit breaker (see feed_health.py).
+
+With PROFILER_ENABLED=1, `kill -USR1 <pid>` (or --profile, for the
+first refresh) samples the next refresh; see profiler.py.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from statistics import median
+from typing import Dict, List, Optional
+
+import app as web
+from fetcher import FeedResult
+from metrics import REGISTRY
+from profiler import PROFILER_ENABLED
+from snapshot import PROFILE_TRIGGER_PATH, REFRESH_TRIGGER_PATH, take_trigger
+
+MIN_INTERVAL = float(os.getenv('REFRESH_MIN_INTERVAL', '120'))
+MAX_INTERVAL = float(os.getenv('REFRESH_MAX_INTERVAL', '1800'))
+DEFAULT_INTERVAL = float(os.getenv('REFRESH_DEFAULT_INTERVAL', '600'))
+JITTER = float(os.getenv('REFRESH_JITTER', '0.1'))
+# Serve /metrics from the refresher itself, where the fetch and pipeline metrics live
+METRICS_PORT = int(os.getenv('REFRESHER_METRICS_PORT', '0'))
+# Recent entries used to estimate a feed's publishing rate
+RATE_WINDOW = 10
+
+
+class FeedSchedule:
+    """When one feed is next due and how its interval adapts"""
+
+    def __init__(self, url: str, interval: float = DEFAULT_INTERVAL,
+                 fixed_interval: Optional[float] = None):
+        self.url = url
+        self.interval = fixed_interval or interval
+        # A poll_interval from the feed registry overrides adaptation
+        self.fixed = fixed_interval is not None
+        self.failures = 0
+        self.next_due = 0.0
+
+    def _clamp(self, seconds: float) -> float:
+        return min(MAX_INTERVAL, max(MIN_INTERVAL, seconds))
+
+    def _schedule(self, delay: float, now: float):
+        self.next_due = now + delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def record(self, result: FeedResult, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        if result.skipped:
+            # Its circuit breaker is open and decides when to probe it again
+            self._schedule(MIN_INTERVAL, now)
+            return
+        if not result.ok:
+            self.failures += 1
+            self._schedule(min(MAX_INTERVAL, MIN_INTERVAL * 2 ** self.failures), now)
+            return
+        self.failures = 0
+        if not self.fixed:
+            self._adapt(result)
+        self._schedule(self.interval, now)
+
+    def _adapt(self, result: FeedResult):
+        if result.feed is not None:
+            gap = publish_gap(result.feed.entries)
+            if gap is not None:
+                self.interval = self._clamp(gap / 2)
+        elif result.not_modified:
+            # Nothing new since the last poll: ease off gradually
+            self.interval = self._clamp(self.interval * 1.25)
+
+
+def publish_gap(entries) -> Optional[float]:
+    """Median seconds between a feed's most recent entries, if it has several"""
+    stamps = sorted((web.parse_timestamp(entry).timestamp() for entry in entries),
+                    reverse=True)[:RATE_WINDOW]
+    gaps = [newer - older for newer, older in zip(stamps, stamps[1:]) if newer > older]
+    return median(gaps) if gaps else None
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port: int) -> ThreadingHTTPServer:
+    """Expose the refresher's metrics on http://0.0.0.0:<port>/metrics"""
+    server = ThreadingHTTPServer(('0.0.0.0', port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True, name='metrics-http').start()
+    print(f"Refresher metrics on port {server.server_address[1]}")
+    return server
+
+
+def run(feeds: List[str] = web.RSS_FEEDS, once: bool = False, profile: bool = False):
+    if METRICS_PORT:
+        serve_metrics(METRICS_PORT)
+    if PROFILER_ENABLED:
+        web.profiler.install_signal()
+    if profile:
+        web.profiler.arm()
+    if web.snapshot_sync is None:
+        print("SNAPSHOT_PATH is not set; web workers will not see refreshed articles")
+    else:
+        # The only process that writes snapshots: warm start from the last
+        # one, then publish every change
+        web.snapshot_sync.writer = True
+        web.snapshot_sync.start()
+
+    # Insertion order keeps due feeds in registry priority order
+    schedules: Dict[str, FeedSchedule] = {
+        url: FeedSchedule(url, fixed_interval=web.feed_registry.get(url).poll_interval)
+        for url in feeds}
+    while True:
+        now = time.monotonic()
+        due = [s.url for s in schedules.values() if s.next_due <= now]
+        if due:
+            print(f"Refreshing {len(due)} feed(s)...")
+            try:
+                web.refresh_articles(due, on_result=lambda r: schedules[r.url].record(r))
+            except Exception as e:
+                print(f"Error refreshing feeds: {e}")
+            # Feeds the fetch never reported (deadline, crash) retry with backoff
+            for url in due:
+                if schedules[url].next_due <= now:
+                    schedules[url].record(FeedResult(url=url, error='no result'))
+            if once:
+                if web.snapshot_sync is not None:
+                    web.snapshot_sync.sync()
+                return
+
+        # Sleep until a feed is due, or a web worker asks for a refresh
+        wake = max(min(s.next_due for s in schedules.values()), time.monotonic() + 1.0)
+        while time.monotonic() < wake:
+            if PROFILER_ENABLED and PROFILE_TRIGGER_PATH and take_trigger(PROFILE_TRIGGER_PATH):
+                print("Profiling the next refresh, as requested by a web worker")
+                web.profiler.arm()
+            if REFRESH_TRIGGER_PATH and take_trigger(REFRESH_TRIGGER_PATH):
+                print("Refresh of every feed requested by a web worker")
+                for schedule in schedules.values():
+                    schedule.next_due = 0.0
+                break
+            time.sleep(min(1.0, max(0.0, wake - time.monotonic())))
+
+
+if __name__ == '__main__':
+    run(once='--once' in sys.argv[1:], profile='--profile' in sys.argv[1:])
@@ -0,0 +1,97 @@
+"""
+Precomputed HTTP responses: serialized (or rendered) and compressed once
+per data version, served with a strong ETag so polling clients and
+returning browsers get 304s.
+
+Only If-None-Match is honoured. Last-Modified is sent for information,
+but articles change in place (LLM summaries, folded reprints) and breaker
+states change without a new refresh time, so a date cannot tell whether
+a body changed; the ETag, a hash of the body, always can.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Hashable, Optional
+
+from flask import Response, current_app
+from werkzeug.http import is_resource_modified
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Below this size compression costs more than it saves
+_MIN_COMPRESS_SIZE = 512
+
+
+class CachedResponse:
+    """One response body in identity, gzip and (optionally) brotli encodings"""
+
+    def __init__(self, body: bytes, mimetype: str = 'application/json',
+                 last_modified: Optional[datetime] = None):
+        self.body = body
+        self.mimetype = mimetype
+        self.last_modified = last_modified
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.encoded = {}
+        if len(body) >= _MIN_COMPRESS_SIZE:
+            self.encoded['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+            if brotli is not None:
+                self.encoded['br'] = brotli.compress(body, quality=5)
+
+    def to_response(self, request) -> Response:
+        """304 if the client's ETag is current, else the best encoding it accepts"""
+        if not is_resource_modified(request.environ, etag=self.etag):
+            response = Response(status=304)
+        else:
+            body, encoding = self.body, None
+            for candidate in ('br', 'gzip'):
+                if candidate in self.encoded and candidate in request.accept_encodings:
+                    body, encoding = self.encoded[candidate], candidate
+                    break
+            response = Response(body, mimetype=self.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(self.etag)
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        response.headers['Vary'] = 'Accept-Encoding'
+        # Clients may keep the body but must revalidate on every poll
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+def json_body(payload) -> bytes:
+    """Serialize exactly as flask.jsonify would"""
+    return (current_app.json.dumps(payload) + '\n').encode('utf-8')
+
+
+class ResponseCache:
+    """Small LRU of CachedResponse objects keyed by data version and query"""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'builds': 0}
+
+    def get_or_build(self, key: Hashable, build: Callable[[], CachedResponse]) -> CachedResponse:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.counters['hits'] += 1
+                return cached
+        # Build outside the lock; concurrent builds of one key are harmless
+        cached = build()
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.counters['builds'] += 1
+        return cached
@@ -19,7 +19,7 @@ def check_python_version():
 def check_dependencies():
     """Check if required packages are installed"""
     required_packages = [
-        'flask', 'feedparser', 'requests', 'python-dateutil', 'gunicorn'
+        'flask', 'feedparser', 'requests', 'numpy', 'python-dateutil', 'gunicorn'
     ]
     
     missing_packages = []
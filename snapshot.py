@@ -0,0 +1,203 @@
+"""
+Versioned article snapshots shared between processes.
+
+One writer, the refresher process, writes the published state to one
+file, swapped in atomically with os.replace. Every gunicorn worker maps
+the file read-only and reloads when a newer one appears, so only one
+process fetches feeds and calls the LLM. Workers ask the writer for a
+refresh, or to profile its next one, by creating a trigger file
+(REFRESH_TRIGGER_PATH, PROFILE_TRIGGER_PATH).
+
+File layout (little-endian):
+
+    magic    8 bytes   b'VNNEWS01'
+    version  u64       article store version (change-feed sequence)
+    count    u32       number of records
+    meta_len u32       length of the JSON metadata block
+    offsets  u64 x (count + 1)   record boundaries, relative to the data area
+    meta     JSON      last_update, tombstones, ...
+    records  JSON x count        one compact JSON document per article
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from article_record import Article
+
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', '')
+SNAPSHOT_INTERVAL = float(os.getenv('SNAPSHOT_INTERVAL', '1'))
+REFRESH_TRIGGER_PATH = os.getenv('REFRESH_TRIGGER_PATH',
+                                 f'{SNAPSHOT_PATH}.refresh' if SNAPSHOT_PATH else '')
+PROFILE_TRIGGER_PATH = os.getenv('PROFILE_TRIGGER_PATH',
+                                 f'{SNAPSHOT_PATH}.profile' if SNAPSHOT_PATH else '')
+
+MAGIC = b'VNNEWS01'
+_HEADER = struct.Struct('<8sQII')
+
+
+def _encode_record(record: Dict) -> bytes:
+    return json.dumps(dict(record, article=record['article'].to_dict()), ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _decode_record(raw: bytes) -> Dict:
+    record = json.loads(raw)
+    record['article'] = Article.from_dict(record['article'])
+    return record
+
+
+def write_snapshot(path: str, version: int, records: List[Dict], meta: Dict):
+    """Write a snapshot next to ``path`` and atomically swap it in"""
+    blobs = [_encode_record(record) for record in records]
+    meta_blob = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, version, len(blobs), len(meta_blob)))
+        f.write(struct.pack(f'<{len(offsets)}Q', *offsets))
+        f.write(meta_blob)
+        for blob in blobs:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """A read-only memory map of one snapshot file; records decode lazily"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.count, meta_len = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not an article snapshot')
+        offsets_start = _HEADER.size
+        self._offsets = struct.unpack_from(f'<{self.count + 1}Q', self._map, offsets_start)
+        meta_start = offsets_start + 8 * (self.count + 1)
+        self.meta = json.loads(self._map[meta_start:meta_start + meta_len])
+        self._data_start = meta_start + meta_len
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, index: int) -> Dict:
+        start = self._data_start + self._offsets[index]
+        end = self._data_start + self._offsets[index + 1]
+        return _decode_record(self._map[start:end])
+
+    def records(self) -> Iterator[Dict]:
+        for index in range(self.count):
+            yield self.record(index)
+
+    def close(self):
+        self._map.close()
+
+
+def file_identity(path: str) -> Optional[Tuple[int, int]]:
+    """(inode, mtime) of ``path``; changes whenever a new snapshot is swapped in"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+def touch_trigger(path: str):
+    """Ask the snapshot writer for something, e.g. a refresh of every feed"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a'):
+        pass
+
+
+def take_trigger(path: str) -> bool:
+    """Whether ``path`` was touched since the last call; consumes the request"""
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+class SnapshotSync:
+    """
+    Background thread that keeps one process and the shared snapshot in step.
+
+    ``load`` receives each new Snapshot, unless its version is older than
+    the last one loaded or written here. Only the ``writer`` publishes:
+    ``export`` returns (version, records, meta) for the local state and is
+    written whenever ``current()`` changes. Started lazily so each
+    gunicorn worker gets its own thread after fork.
+    """
+
+    def __init__(self, path: str, export: Callable[[], Tuple[int, List[Dict], Dict]],
+                 current: Callable[[], Tuple], load: Callable[[Snapshot], None],
+                 interval: float = SNAPSHOT_INTERVAL, writer: bool = False):
+        self.path = path
+        self.export = export
+        self.current = current
+        self.load = load
+        self.interval = interval
+        self.writer = writer
+        self._published = None
+        self._version: Optional[int] = None
+        self._seen_identity = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                # Load before the first request is served, not a tick later
+                try:
+                    self.sync()
+                except Exception as e:
+                    print(f"Snapshot sync error: {e}")
+                self._thread = threading.Thread(target=self._run, daemon=True,
+                                                name='snapshot-sync')
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Snapshot sync error: {e}")
+            time.sleep(self.interval)
+
+    def sync(self):
+        """Load a newer snapshot written elsewhere; the writer publishes local changes"""
+        identity = file_identity(self.path)
+        if identity is not None and identity != self._seen_identity:
+            snapshot = Snapshot(self.path)
+            self._seen_identity = snapshot.identity
+            try:
+                if self._version is not None and snapshot.version < self._version:
+                    print(f"Ignoring snapshot version {snapshot.version}, older than {self._version}")
+                else:
+                    self.load(snapshot)
+                    self._version = snapshot.version
+            finally:
+                snapshot.close()
+            self._published = self.current()
+            return
+
+        if self.writer and self.current() != self._published:
+            version, records, meta = self.export()
+            write_snapshot(self.path, version, records, meta)
+            self._version = version
+            self._seen_identity = file_identity(self.path)
+            self._published = self.current()
@@ -1,6 +1,28 @@
 import os
 import re
-from typing import Optional
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from extractive import ExtractiveSummarizer
+from keywords import FINANCIAL, has_filter_term, iter_matches
+from summary_cache import SummaryCache, summary_key
+from textnorm import truncate
+
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+SYSTEM_PROMPT = "Bạn là một chuyên gia tóm tắt tin tức tài chính và chính sách bằng tiếng Việt."
+# Bump whenever the prompt or its post-processing changes, to invalidate cached summaries
+PROMPT_VERSION = 1
+# 'openai', or 'stub' for a local stand-in used in development and benchmarks
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'openai')
+LLM_STUB_LATENCY = float(os.getenv('LLM_STUB_LATENCY', '0'))
+# Summary every article gets right away, offline: 'simple' (rule-based phrases)
+# or 'extractive' (its key sentence, see extractive.py)
+SUMMARIZER_BACKEND = os.getenv('SUMMARIZER_BACKEND', 'simple')
+# Most articles one call to local_summaries handles together in a refresh
+SUMMARIZER_BATCH_SIZE = int(os.getenv('SUMMARIZER_BATCH_SIZE', '64'))
+
+summary_cache = SummaryCache()
+extractive_summarizer = ExtractiveSummarizer() if SUMMARIZER_BACKEND == 'extractive' else None
 
 def summarize_article(title: str, content: str = "", use_openai: bool = False) -> Optional[str]:
     """
@@ -17,42 +39,45 @@ def summarize_article(title: str, content: str = "", use_openai: bool = False) -
     if not title:
         return None
     
-    # Simple rule-based summarization for basic cases
+    # Local summarization (SUMMARIZER_BACKEND) for basic cases
     if not use_openai:
-        return create_simple_summary(title, content)
+        return create_local_summary(title, content)
     
     # OpenAI-based summarization
     try:
         return create_openai_summary(title, content)
     except Exception as e:
         print(f"OpenAI summarization failed: {e}")
-        return create_simple_summary(title, content)
+        return create_local_summary(title, content)
+
+def local_summaries(articles: Sequence[Tuple[str, str]]) -> List[str]:
+    """
+    Offline summaries of many (title, content) articles at once, from the
+    SUMMARIZER_BACKEND; the extractive one vectorizes the whole batch
+    """
+    if extractive_summarizer is None:
+        return [create_simple_summary(title, content) for title, content in articles]
+    sentences = extractive_summarizer.summarize(articles)
+    # Articles with nothing to extract beyond the title get the rule-based summary
+    return [truncate(sentence) if sentence else create_simple_summary(title, content)
+            for sentence, (title, content) in zip(sentences, articles)]
+
+def create_local_summary(title: str, content: str = "") -> str:
+    """Summary of one article from the SUMMARIZER_BACKEND"""
+    return local_summaries([(title, content)])[0]
 
 def create_simple_summary(title: str, content: str = "") -> str:
     """Create a simple summary using rule-based approach"""
-    # Extract key financial/policy terms
-    financial_terms = [
-        'tăng trưởng', 'kinh tế', 'GDP', 'lạm phát', 'lãi suất', 'tỷ giá',
-        'chứng khoán', 'thị trường', 'đầu tư', 'ngân hàng', 'tài chính',
-        'chính sách', 'thuế', 'ngân sách', 'nợ công', 'xuất khẩu', 'nhập khẩu',
-        'doanh nghiệp', 'công ty', 'cổ phiếu', 'trái phiếu', 'bất động sản'
-    ]
-    
-    policy_terms = [
-        'chính sách', 'luật', 'nghị định', 'thông tư', 'quyết định',
-        'chính phủ', 'bộ', 'ngành', 'cơ quan', 'quy định', 'hướng dẫn'
-    ]
-    
-    # Check if title contains financial or policy terms
-    title_lower = title.lower()
-    
+    # Extract key financial/policy terms from the title, in order of appearance
     found_terms = []
-    for term in financial_terms + policy_terms:
-        if term in title_lower:
-            found_terms.append(term)
+    has_financial = False
+    for match in iter_matches(title):
+        if match.term not in found_terms:
+            found_terms.append(match.term)
+        has_financial = has_financial or match.category == FINANCIAL
     
     if found_terms:
-        if any(term in title_lower for term in financial_terms):
+        if has_financial:
             return f"Tin tức về {', '.join(found_terms[:2])} trong lĩnh vực tài chính."
         else:
             return f"Thông tin chính sách liên quan đến {', '.join(found_terms[:2])}."
@@ -63,18 +88,9 @@ def create_simple_summary(title: str, content: str = "") -> str:
     else:
         return "Cập nhật mới nhất từ thị trường tài chính."
 
-def create_openai_summary(title: str, content: str = "") -> str:
-    """Create summary using OpenAI API"""
-    try:
-        import openai
-        
-        # Check if OpenAI API key is available
-        if not os.getenv('OPENAI_API_KEY'):
-            raise ValueError("OpenAI API key not found")
-        
-        openai.api_key = os.getenv('OPENAI_API_KEY')
-        
-        prompt = f"""
+def build_openai_prompt(title: str, content: str = "") -> str:
+    """User prompt sent to the model for one article"""
+    return f"""
         Tóm tắt ngắn gọn tin tức sau bằng một câu tiếng Việt (tối đa 20 từ):
         
         Tiêu đề: {title}
@@ -82,39 +98,76 @@ def create_openai_summary(title: str, content: str = "") -> str:
         
         Tóm tắt:
         """
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Bạn là một chuyên gia tóm tắt tin tức tài chính và chính sách bằng tiếng Việt."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=50,
-            temperature=0.3
-        )
-        
-        summary = response.choices[0].message.content.strip()
-        
-        # Clean up the summary
-        summary = re.sub(r'^["\']|["\']$', '', summary)  # Remove quotes
-        summary = re.sub(r'^Tóm tắt:\s*', '', summary, flags=re.IGNORECASE)  # Remove "Tóm tắt:" prefix
-        
-        return summary if summary else create_simple_summary(title, content)
-        
+
+def request_openai_summary(title: str, content: str = "") -> str:
+    """Call the OpenAI API once; raises on any failure"""
+    import openai
+    
+    # Check if OpenAI API key is available
+    if not os.getenv('OPENAI_API_KEY'):
+        raise ValueError("OpenAI API key not found")
+    
+    openai.api_key = os.getenv('OPENAI_API_KEY')
+    
+    response = openai.ChatCompletion.create(
+        model=OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": build_openai_prompt(title, content)}
+        ],
+        max_tokens=50,
+        temperature=0.3
+    )
+    
+    summary = response.choices[0].message.content.strip()
+    
+    # Clean up the summary
+    summary = re.sub(r'^["\']|["\']$', '', summary)  # Remove quotes
+    summary = re.sub(r'^Tóm tắt:\s*', '', summary, flags=re.IGNORECASE)  # Remove "Tóm tắt:" prefix
+    
+    return summary
+
+def stub_llm_summary(title: str, content: str = "") -> str:
+    """Offline stand-in for the LLM with a configurable latency"""
+    if LLM_STUB_LATENCY:
+        time.sleep(LLM_STUB_LATENCY)
+    return f"Tóm tắt: {title}"
+
+def get_llm_backend() -> Callable[[str, str], str]:
+    """Function producing one LLM summary for the configured backend"""
+    if LLM_BACKEND == 'stub':
+        return stub_llm_summary
+    return request_openai_summary
+
+def llm_enabled() -> bool:
+    """Whether LLM summaries should be generated at all"""
+    return LLM_BACKEND == 'stub' or os.getenv('OPENAI_API_KEY') is not None
+
+def llm_cache_key(title: str, content: str = "") -> str:
+    model = OPENAI_MODEL if LLM_BACKEND == 'openai' else LLM_BACKEND
+    # Only the first 500 characters of content reach the prompt
+    return summary_key(title, content[:500], model, PROMPT_VERSION)
+
+def create_openai_summary(title: str, content: str = "") -> str:
+    """Create summary using OpenAI API, reusing cached summaries"""
+    key = llm_cache_key(title, content)
+    cached = summary_cache.get(key)
+    if cached:
+        return cached
+    
+    try:
+        summary = get_llm_backend()(title, content)
     except Exception as e:
         print(f"OpenAI API error: {e}")
-        return create_simple_summary(title, content)
+        return create_local_summary(title, content)
+    
+    if not summary:
+        return create_local_summary(title, content)
+    
+    # Fallback summaries are never cached, so failures get retried
+    summary_cache.set(key, summary)
+    return summary
 
 def is_financial_news(title: str, content: str = "") -> bool:
     """Check if the article is related to finance or policy"""
-    financial_keywords = [
-        'tài chính', 'kinh tế', 'ngân hàng', 'chứng khoán', 'đầu tư',
-        'GDP', 'lạm phát', 'lãi suất', 'tỷ giá', 'thị trường',
-        'chính sách', 'thuế', 'ngân sách', 'nợ công', 'xuất khẩu',
-        'nhập khẩu', 'doanh nghiệp', 'cổ phiếu', 'trái phiếu',
-        'bất động sản', 'tiền tệ', 'vốn', 'tín dụng'
-    ]
-    
-    text_to_check = (title + " " + content).lower()
-    return any(keyword in text_to_check for keyword in financial_keywords)
-
+    return has_filter_term(title + " " + content)
@@ -0,0 +1,135 @@
+"""
+Two-tier cache for LLM summaries: an in-memory LRU in front of SQLite
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+SUMMARY_CACHE_PATH = os.getenv('SUMMARY_CACHE_PATH', os.path.join('.cache', 'summaries.sqlite3'))
+SUMMARY_CACHE_MEMORY_SIZE = int(os.getenv('SUMMARY_CACHE_MEMORY_SIZE', '2048'))
+SUMMARY_CACHE_MAX_ROWS = int(os.getenv('SUMMARY_CACHE_MAX_ROWS', '50000'))
+SUMMARY_CACHE_TTL_DAYS = float(os.getenv('SUMMARY_CACHE_TTL_DAYS', '30'))
+
+# Run disk eviction after this many inserts rather than on every write
+_PRUNE_EVERY = 200
+
+
+def summary_key(title: str, content: str, model: str, prompt_version: int) -> str:
+    """Cache key for everything that determines the generated summary"""
+    raw = '\x1f'.join((model, str(prompt_version), title, content))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """LRU memory tier plus a size- and TTL-bounded SQLite tier"""
+
+    def __init__(self, path: Optional[str] = SUMMARY_CACHE_PATH,
+                 memory_size: int = SUMMARY_CACHE_MEMORY_SIZE,
+                 max_rows: int = SUMMARY_CACHE_MAX_ROWS,
+                 ttl_days: float = SUMMARY_CACHE_TTL_DAYS):
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self.ttl = ttl_days * 86400
+        # key -> (summary, created_at); created_at applies the same TTL as disk
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+                         'stores': 0, 'evictions': 0}
+        self._db = self._connect(path) if path else None
+
+    def _connect(self, path: str) -> Optional[sqlite3.Connection]:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('''
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            db.execute('CREATE INDEX IF NOT EXISTS summaries_last_used ON summaries (last_used)')
+            db.commit()
+            return db
+        except Exception as e:
+            # Read-only filesystems (e.g. serverless) still get the memory tier
+            print(f"Summary cache disk tier disabled: {e}")
+            return None
+
+    def _remember(self, key: str, summary: str, created_at: float):
+        self._memory[key] = (summary, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            now = time.time()
+            entry = self._memory.get(key)
+            if entry is not None:
+                summary, created_at = entry
+                if created_at >= now - self.ttl:
+                    self._memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return summary
+                del self._memory[key]
+                self.counters['evictions'] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    'SELECT summary, created_at FROM summaries WHERE key = ? AND created_at >= ?',
+                    (key, now - self.ttl)).fetchone()
+                if row:
+                    self._db.execute('UPDATE summaries SET last_used = ? WHERE key = ?', (now, key))
+                    self._db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.counters['disk_hits'] += 1
+                    return row[0]
+
+            self.counters['misses'] += 1
+            return None
+
+    def set(self, key: str, summary: str):
+        with self._lock:
+            now = time.time()
+            self._remember(key, summary, now)
+            self.counters['stores'] += 1
+            if self._db is None:
+                return
+            self._db.execute(
+                'INSERT OR REPLACE INTO summaries (key, summary, created_at, last_used) VALUES (?, ?, ?, ?)',
+                (key, summary, now, now))
+            self._inserts += 1
+            if self._inserts % _PRUNE_EVERY == 0:
+                self._prune(now)
+            self._db.commit()
+
+    def _prune(self, now: float):
+        """Drop expired rows, then least recently used rows over the size cap"""
+        removed = self._db.execute('DELETE FROM summaries WHERE created_at < ?',
+                                   (now - self.ttl,)).rowcount
+        (count,) = self._db.execute('SELECT COUNT(*) FROM summaries').fetchone()
+        if count > self.max_rows:
+            removed += self._db.execute(
+                'DELETE FROM summaries WHERE key IN '
+                '(SELECT key FROM summaries ORDER BY last_used LIMIT ?)',
+                (count - self.max_rows,)).rowcount
+        self.counters['evictions'] += removed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+            lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+            stats['hit_ratio'] = round((lookups - stats['misses']) / lookups, 3) if lookups else None
+            stats['memory_entries'] = len(self._memory)
+            return stats
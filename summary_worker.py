@@ -0,0 +1,184 @@
+"""
+Background LLM summarization, decoupled from feed fetching.
+
+Articles are published straight away with the rule-based summary. The
+worker then asks the LLM for a better one on a small thread pool, under a
+requests-per-minute / tokens-per-minute limit with retry and backoff, and
+upgrades the article dict in place when the summary arrives.
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+from article_record import Article
+from metrics import LLM_CALLS, LLM_SECONDS, LLM_TOKENS, log_event
+from summarizer import LLM_BACKEND, build_openai_prompt, get_llm_backend, llm_cache_key, summary_cache
+
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', '4'))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv('LLM_REQUESTS_PER_MINUTE', '60'))
+LLM_TOKENS_PER_MINUTE = float(os.getenv('LLM_TOKENS_PER_MINUTE', '40000'))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '3'))
+LLM_BACKOFF_SECONDS = float(os.getenv('LLM_BACKOFF_SECONDS', '2'))
+
+# Completion budget per request, matching max_tokens in the OpenAI call
+_COMPLETION_TOKENS = 50
+
+
+def estimate_tokens(title: str, content: str = "") -> int:
+    """Rough prompt + completion token count (Vietnamese is ~2 chars/token)"""
+    return len(build_openai_prompt(title, content)) // 2 + _COMPLETION_TOKENS
+
+
+class RateLimiter:
+    """Token buckets for requests and tokens per minute; acquire() blocks"""
+
+    def __init__(self, requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = LLM_TOKENS_PER_MINUTE):
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        self.request_capacity = max(1.0, requests_per_minute)
+        self.token_capacity = max(1.0, tokens_per_minute)
+        self._requests = self.request_capacity
+        self._tokens = self.token_capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.request_capacity, self._requests + elapsed * self.request_rate)
+        self._tokens = min(self.token_capacity, self._tokens + elapsed * self.token_rate)
+
+    def acquire(self, tokens: int = 1):
+        tokens = min(tokens, self.token_capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max((1 - self._requests) / self.request_rate if self._requests < 1 else 0,
+                           (tokens - self._tokens) / self.token_rate if self._tokens < tokens else 0)
+            time.sleep(wait)
+
+
+class SummaryWorker:
+    """Upgrades published articles with LLM summaries in the background"""
+
+    def __init__(self, backend: Optional[Callable[[str, str], str]] = None,
+                 concurrency: int = LLM_CONCURRENCY,
+                 limiter: Optional[RateLimiter] = None,
+                 max_retries: int = LLM_MAX_RETRIES,
+                 on_update: Optional[Callable[[Article], None]] = None):
+        self.backend = backend
+        self.concurrency = concurrency
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.on_update = on_update
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = set()
+        # url -> (article, content) for jobs that ran out of retries
+        self._failed: Dict[str, Tuple[Article, str]] = {}
+        self.counters = {'submitted': 0, 'cached': 0, 'completed': 0,
+                         'retries': 0, 'failed': 0}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created lazily so each gunicorn worker gets its own threads after fork
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                thread_name_prefix='llm-summary')
+        return self._executor
+
+    def _apply(self, article: Article, summary: str):
+        article.summary = summary
+        article.ai_summary = True
+        if self.on_update:
+            self.on_update(article)
+
+    def submit(self, article: Article, content: str = "") -> bool:
+        """
+        Queue an article for an LLM summary.
+
+        Summaries already in the cache are applied immediately; returns
+        True if the article was upgraded synchronously.
+        """
+        cached = summary_cache.get(llm_cache_key(article.title, content))
+        if cached:
+            self.counters['cached'] += 1
+            self._apply(article, cached)
+            return True
+
+        url = article.url
+        with self._lock:
+            if url in self._pending:
+                return False
+            self._pending.add(url)
+            self._failed.pop(url, None)
+            self.counters['submitted'] += 1
+        self._pool().submit(self._run, article, content)
+        return False
+
+    def retry_failed(self) -> int:
+        """Resubmit articles whose earlier attempts all failed"""
+        with self._lock:
+            failed = list(self._failed.values())
+            self._failed.clear()
+        for article, content in failed:
+            self.submit(article, content)
+        return len(failed)
+
+    def _run(self, article: Article, content: str):
+        title = article.title
+        backend = self.backend or get_llm_backend()
+        backend_name = LLM_BACKEND if self.backend is None else 'custom'
+        tokens = estimate_tokens(title, content)
+        try:
+            for attempt in range(self.max_retries + 1):
+                self.limiter.acquire(tokens)
+                started = time.perf_counter()
+                try:
+                    summary = backend(title, content)
+                except Exception as e:
+                    self._observe(backend_name, 'error', started, tokens, article.url)
+                    if attempt == self.max_retries:
+                        print(f"LLM summary failed for {article.url}: {e}")
+                        break
+                    self.counters['retries'] += 1
+                    delay = LLM_BACKOFF_SECONDS * (2 ** attempt)
+                    time.sleep(delay + random.uniform(0, delay / 2))
+                    continue
+                self._observe(backend_name, 'ok', started, tokens, article.url)
+                if summary:
+                    summary_cache.set(llm_cache_key(title, content), summary)
+                    self._apply(article, summary)
+                    self.counters['completed'] += 1
+                    return
+                break
+            self.counters['failed'] += 1
+            with self._lock:
+                self._failed[article.url] = (article, content)
+        finally:
+            with self._lock:
+                self._pending.discard(article.url)
+
+    @staticmethod
+    def _observe(backend: str, outcome: str, started: float, tokens: int, url: str):
+        elapsed = time.perf_counter() - started
+        LLM_CALLS.inc(backend=backend, outcome=outcome)
+        LLM_SECONDS.observe(elapsed, backend=backend)
+        LLM_TOKENS.inc(tokens, backend=backend)
+        log_event('llm_call', backend=backend, outcome=outcome, seconds=round(elapsed, 3),
+                  tokens=tokens, url=url)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.counters)
+            stats['pending'] = len(self._pending)
+            return stats
@@ -17,7 +17,6 @@ def test_template_changes():
         ('background-color: #fff', 'White background'),
         ('background: #000', 'Black header background'),
         ('border: 1px solid #000', 'Black borders'),
-        ('entries[:20]', '20 articles per feed limit')
     ]
     
     print("Testing template changes...")
@@ -28,14 +27,39 @@ def test_template_changes():
             print(f"{description}")
 
 def test_app_changes():
-    """Test if app.py has 20 articles limit"""
+    """Test if feeds default to 20 articles each, set per feed in feeds.json"""
+    from feed_registry import DEFAULT_MAX_ENTRIES, FeedRegistry
+
     with open('app.py', 'r') as f:
         content = f.read()
     
-    if 'entries[:20]' in content:
-        print("App.py has 20 articles per feed limit")
-    else:
-        print("App.py still has old limit")
+    registry = FeedRegistry.load()
+    assert DEFAULT_MAX_ENTRIES == 20
+    assert registry.get('https://example.com/unknown.rss').max_entries == 20
+    assert all(feed.max_entries > 0 for feed in registry.feeds)
+    assert '.max_entries' in content, "app.py does not apply the per-feed max_entries"
+    print("App.py takes up to max_entries (default 20) articles per feed from feeds.json")
+
+def test_relevance_gate():
+    """Policy words alone must not pass MIN_RELEVANCE; finance news must"""
+    from ranking import MIN_RELEVANCE, keyword_score
+
+    off_topic = [
+        "Hướng dẫn nấu phở ngon tại nhà",
+        "Luật bóng đá mới của FIFA",
+        "Quyết định bất ngờ của HLV Park",
+        "Cơ quan chức năng điều tra vụ cháy",
+    ]
+    finance = [
+        "Ngân hàng Nhà nước giữ nguyên lãi suất điều hành",
+        "Chính phủ ban hành nghị định mới về thuế",
+        "Tỷ giá USD hôm nay tăng nhẹ",
+    ]
+    for title in off_topic:
+        assert keyword_score(title) < MIN_RELEVANCE, title
+    for title in finance:
+        assert keyword_score(title) >= MIN_RELEVANCE, title
+    print("Relevance gate keeps finance news and drops policy-only titles")
 
 if __name__ == "__main__":
     print("Testing Vietnamese Finance News Aggregator Changes")
@@ -44,6 +68,8 @@ if __name__ == "__main__":
     test_template_changes()
     print()
     test_app_changes()
+    print()
+    test_relevance_gate()
     
     print("\nAll changes verified!")
 
@@ -6,15 +6,10 @@ Test script to verify RSS feeds are working correctly
 import feedparser
 from datetime import datetime
 
-# RSS feed URLs
-RSS_FEEDS = [
-    "https://vnexpress.net/rss/kinh-doanh.rss",
-    "https://cafef.vn/home.rss", 
-    "https://ndh.vn/rss",
-    "https://baodautu.vn/rss",
-    "https://www.vietnamplus.vn/rss/kinhte.rss",
-    "https://thoibaotaichinhvietnam.vn/rss"
-]
+from feed_registry import FeedRegistry
+
+# Enabled feeds from feeds.json
+RSS_FEEDS = FeedRegistry.load().urls()
 
 def test_feed(feed_url):
     """Test a single RSS feed"""
@@ -0,0 +1,46 @@
+"""
+Text normalization for feed fields: tag stripping, entity decoding,
+whitespace collapsing, Unicode NFC and word-boundary truncation
+"""
+
+import html
+import re
+import unicodedata
+
+_TAG = re.compile(r'<[^>]*>')
+_IMG_TEXT = re.compile(r'<img\b[^>]*?\b(?:alt|title)\s*=\s*(["\'])(.*?)\1', re.IGNORECASE | re.DOTALL)
+
+
+def clean_html(text: str) -> str:
+    """
+    Plain text of an HTML fragment on one line.
+
+    Tags become word breaks, entities (&amp;, &#7871;) are decoded and
+    whitespace is collapsed. A fragment that is only an image yields the
+    image's alt (or title) text. Steps a string does not need (no '<',
+    no '&', already NFC) are skipped.
+    """
+    if not text:
+        return ""
+    stripped = _TAG.sub(' ', text) if '<' in text else text
+    if '&' in stripped:
+        stripped = html.unescape(stripped)
+    stripped = ' '.join(stripped.split())
+    if not stripped and '<' in text:
+        match = _IMG_TEXT.search(text)
+        if match:
+            stripped = ' '.join(html.unescape(match.group(2)).split())
+    # Feeds mix precomposed and combining Vietnamese diacritics
+    if not stripped.isascii() and not unicodedata.is_normalized('NFC', stripped):
+        stripped = unicodedata.normalize('NFC', stripped)
+    return stripped
+
+
+def truncate(text: str, limit: int = 200, ellipsis: str = '...') -> str:
+    """``text`` cut to at most ``limit`` characters at a word boundary, plus ``ellipsis``"""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(' ', 0, limit + 1)
+    # A single overlong word is cut mid-word rather than dropped
+    head = text[:cut] if cut > limit // 2 else text[:limit]
+    return head.rstrip(' ,;:.-') + ellipsis